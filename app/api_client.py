@@ -6,9 +6,27 @@ from .config import config_manager
 
 logger = logging.getLogger(__name__)
 
-# Note: aiohttp.ClientSession is typically created once and reused.
-# For simplicity here, we create it per request in _make_request.
-# Consider managing a single session instance in main.py for better performance.
+# --- Shared HTTP Session ---
+# A single aiohttp.ClientSession is reused for all API calls so keep-alive connections
+# to the API server survive between requests and scheduled runs.
+# It is created lazily so that it binds to the running event loop.
+_session: aiohttp.ClientSession | None = None
+
+def _get_session() -> aiohttp.ClientSession:
+    """Returns the shared ClientSession, creating it on first use (or after it was closed)."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        logger.debug("Created shared aiohttp ClientSession for API requests.")
+    return _session
+
+async def close_session():
+    """Closes the shared ClientSession. Should be called once on application shutdown."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("Closed shared aiohttp ClientSession.")
+    _session = None
 
 async def _make_request(method: str, endpoint: str, params: dict = None, json_data: dict = None) -> dict | None:
     """Helper function to make async API requests and handle common errors."""
@@ -23,51 +41,89 @@ async def _make_request(method: str, endpoint: str, params: dict = None, json_da
     relative_endpoint = endpoint.lstrip('/')
     full_url = urljoin(base_url, relative_endpoint)
 
-    # Create a session for each request - less efficient but simpler for now
-    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
-        try:
-            logger.debug(f"Making async {method} request to {full_url} with params={params}, json={json_data}")
-            async with session.request(method, full_url, params=params, json=json_data) as response:
-                # Check status code
-                if response.status == 204: # No Content
-                    logger.debug(f"Received 204 No Content from {full_url}")
-                    return {} # Or None, depending on expected behavior
-
-                # Raises ClientResponseError for bad responses (4xx or 5xx)
-                response.raise_for_status()
-
-                # Handle potential empty responses or non-JSON responses gracefully
-                # Check content length header first if available
-                if response.content_length == 0:
-                     logger.warning(f"Received empty response body (Content-Length: 0) from {full_url}")
+    session = _get_session()
+    try:
+        logger.debug(f"Making async {method} request to {full_url} with params={params}, json={json_data}")
+        async with session.request(method, full_url, params=params, json=json_data) as response:
+            # Check status code
+            if response.status == 204: # No Content
+                logger.debug(f"Received 204 No Content from {full_url}")
+                return {} # Or None, depending on expected behavior
+
+            # Raises ClientResponseError for bad responses (4xx or 5xx)
+            response.raise_for_status()
+
+            # Handle potential empty responses or non-JSON responses gracefully
+            # Check content length header first if available
+            if response.content_length == 0:
+                 logger.warning(f"Received empty response body (Content-Length: 0) from {full_url}")
+                 return None
+
+            try:
+                # Use content_type='application/json' to avoid issues if server sends wrong type
+                json_response = await response.json(content_type=None)
+                if json_response is None: # Handle cases where response.json() returns None
+                     logger.warning(f"Received null JSON response from {full_url}")
                      return None
+                return json_response
+            except aiohttp.ContentTypeError:
+                # Log the actual content type and some text
+                response_text = await response.text()
+                logger.exception(f"Failed to decode JSON response from {full_url}. Content-Type: {response.content_type}. Response text: {response_text[:200]}...")
+                return None
+            except Exception as json_e: # Catch potential json.JSONDecodeError etc.
+                response_text = await response.text()
+                logger.exception(f"Error decoding JSON from {full_url}: {json_e}. Response text: {response_text[:200]}...")
+                return None
+
+    except asyncio.TimeoutError:
+        logger.error(f"Request timed out for {method} {full_url}")
+        return None
+    except aiohttp.ClientError as e: # Includes ClientConnectionError, ClientResponseError etc.
+        logger.exception(f"aiohttp client error during {method} request to {full_url}: {e}")
+        return None
+    except Exception as e:
+        logger.exception(f"An unexpected error occurred during async API request to {full_url}: {e}")
+        return None
 
-                try:
-                    # Use content_type='application/json' to avoid issues if server sends wrong type
-                    json_response = await response.json(content_type=None)
-                    if json_response is None: # Handle cases where response.json() returns None
-                         logger.warning(f"Received null JSON response from {full_url}")
-                         return None
-                    return json_response
-                except aiohttp.ContentTypeError:
-                    # Log the actual content type and some text
-                    response_text = await response.text()
-                    logger.exception(f"Failed to decode JSON response from {full_url}. Content-Type: {response.content_type}. Response text: {response_text[:200]}...")
-                    return None
-                except Exception as json_e: # Catch potential json.JSONDecodeError etc.
-                    response_text = await response.text()
-                    logger.exception(f"Error decoding JSON from {full_url}: {json_e}. Response text: {response_text[:200]}...")
-                    return None
 
-        except asyncio.TimeoutError:
-            logger.error(f"Request timed out for {method} {full_url}")
-            return None
-        except aiohttp.ClientError as e: # Includes ClientConnectionError, ClientResponseError etc.
-            logger.exception(f"aiohttp client error during {method} request to {full_url}: {e}")
-            return None
-        except Exception as e:
-            logger.exception(f"An unexpected error occurred during async API request to {full_url}: {e}")
-            return None
+async def download_image(image_url: str, max_bytes: int) -> bytes | None:
+    """
+    Downloads an image using the shared session.
+
+    Args:
+        image_url: Absolute URL of the image.
+        max_bytes: Images larger than this are not downloaded.
+
+    Returns:
+        The image bytes, or None if the download failed or the image is too large.
+    """
+    session = _get_session()
+    try:
+        async with session.get(image_url) as response:
+            response.raise_for_status()
+            if response.content_length is not None and response.content_length > max_bytes:
+                logger.warning(f"Image too large to download ({response.content_length} bytes, limit {max_bytes}): {image_url}")
+                return None
+            # Read until EOF (content.read(n) only returns what is already buffered),
+            # giving up as soon as the body exceeds the limit
+            chunks = []
+            total = 0
+            async for chunk in response.content.iter_chunked(65536):
+                total += len(chunk)
+                if total > max_bytes:
+                    logger.warning(f"Image exceeds {max_bytes} bytes, not using downloaded copy: {image_url}")
+                    return None
+                chunks.append(chunk)
+            data = b"".join(chunks)
+            logger.debug(f"Downloaded image ({len(data)} bytes): {image_url}")
+            return data
+    except asyncio.TimeoutError:
+        logger.error(f"Image download timed out: {image_url}")
+        return None
+    except aiohttp.ClientError as e:
+        logger.error(f"Could not download image {image_url}: {e}")
+        return None
 
 
 async def get_ranking() -> list:
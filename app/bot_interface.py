@@ -1,5 +1,4 @@
 import logging
-import re
 import pytz
 from datetime import datetime
 from telegram import Update
@@ -11,20 +10,10 @@ from app.config import config_manager
 from app.stats_manager import get_current_stats, Stats  # Import the Stats dataclass too
 from app.data_handler import load_posted_articles
 from app.config import BOT_START_TIME_UTC
+from app.telegram_poster import escape_markdown_v2
 
 logger = logging.getLogger(__name__)
 
-# --- Telegram MarkdownV2 Escaping ---
-# Characters to escape: _ * [ ] ( ) ~ ` > # + - = | { } . !
-def escape_markdown_v2(text: str) -> str:
-    """Escapes text for Telegram MarkdownV2 parsing."""
-    if not isinstance(text, str):
-        return ""
-    # Ensure '.' and '!' are included as per Telegram MarkdownV2 spec
-    escape_chars = r'_*[]()~`>#+-=|{}.!'
-    # Use re.sub to escape characters: \[char]
-    return re.sub(f'([{re.escape(escape_chars)}])', r'\\\1', text)
-
 # --- Command Handler ---
 
 async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -17,9 +17,15 @@ DEFAULT_CONFIG = {
     "schedule_interval_minutes": 10,
     "openai_max_tokens": 1000,
     "openai_temperature": 0.7,
+    "openai_max_concurrent_requests": 5, # Parallel translation requests per run
+    "openai_batch_threshold": 0, # Use the Batch API when a run has more new articles than this (0 = never)
     "skip_keywords": [], # Default to empty list
     "openai_api_base_url": None, # Default to None (use OpenAI default)
+    "openai_use_direct_http": False, # Post completions with aiohttp instead of the OpenAI SDK
     "authorized_user_ids": [], # Default to empty list (allow all users)
+    "telegram_max_concurrent_posts": 1, # Posts in flight at once; 1 keeps ranking order in the channel
+    "translation_cache_file": "data/translation_cache.sqlite3", # Set to empty/null to disable caching
+    "translation_cache_ttl_hours": 168, # Cached translations expire after 7 days
     # Required keys don't strictly need defaults here if they MUST be in the file,
     # but providing None helps structure. The manager handles validation.
     "api_base_url": None,
@@ -21,6 +21,7 @@ class ConfigManager:
         self._observer = None
         self._observer_thread = None
         self._stop_event = threading.Event()
+        self._reload_callbacks = []
 
         self._load_config() # Initial load
 
@@ -57,6 +58,30 @@ class ConfigManager:
                 logger.warning(f"Invalid openai_temperature. Using default: {self.defaults.get('openai_temperature')}")
                 new_config['openai_temperature'] = self.defaults.get('openai_temperature')
 
+            try:
+                new_config['openai_max_concurrent_requests'] = int(new_config.get('openai_max_concurrent_requests', self.defaults.get('openai_max_concurrent_requests')))
+            except (ValueError, TypeError):
+                logger.warning(f"Invalid openai_max_concurrent_requests. Using default: {self.defaults.get('openai_max_concurrent_requests')}")
+                new_config['openai_max_concurrent_requests'] = self.defaults.get('openai_max_concurrent_requests')
+
+            try:
+                new_config['openai_batch_threshold'] = int(new_config.get('openai_batch_threshold', self.defaults.get('openai_batch_threshold')))
+            except (ValueError, TypeError):
+                logger.warning(f"Invalid openai_batch_threshold. Using default: {self.defaults.get('openai_batch_threshold')}")
+                new_config['openai_batch_threshold'] = self.defaults.get('openai_batch_threshold')
+
+            try:
+                new_config['telegram_max_concurrent_posts'] = int(new_config.get('telegram_max_concurrent_posts', self.defaults.get('telegram_max_concurrent_posts')))
+            except (ValueError, TypeError):
+                logger.warning(f"Invalid telegram_max_concurrent_posts. Using default: {self.defaults.get('telegram_max_concurrent_posts')}")
+                new_config['telegram_max_concurrent_posts'] = self.defaults.get('telegram_max_concurrent_posts')
+
+            try:
+                new_config['translation_cache_ttl_hours'] = int(new_config.get('translation_cache_ttl_hours', self.defaults.get('translation_cache_ttl_hours')))
+            except (ValueError, TypeError):
+                logger.warning(f"Invalid translation_cache_ttl_hours. Using default: {self.defaults.get('translation_cache_ttl_hours')}")
+                new_config['translation_cache_ttl_hours'] = self.defaults.get('translation_cache_ttl_hours')
+
             # Handle list type for skip_keywords
             skip_keywords = new_config.get('skip_keywords')
             if isinstance(skip_keywords, list):
@@ -161,12 +186,23 @@ class ConfigManager:
         try:
             self._load_config()
             logger.info("Configuration reloaded successfully.")
-            # Optionally: Add a hook/callback mechanism here if specific modules
-            # need to react immediately to changes (e.g., re-init logging)
-            # For now, modules will get updated values on their next call to get().
+            # Most modules simply get updated values on their next call to get();
+            # modules that cache derived values are notified through their callbacks.
+            for callback in list(self._reload_callbacks):
+                callback()
         except Exception as e:
             logger.exception(f"Error reloading configuration: {e}. Previous configuration remains active.")
 
+    def register_reload_callback(self, callback):
+        """
+        Registers a no-argument callable to run after every configuration reload.
+
+        Used by modules that cache values derived from the configuration, e.g.
+        `register_reload_callback(cached_settings.cache_clear)`. Callbacks run on the
+        watcher thread, so they should be quick and thread-safe.
+        """
+        self._reload_callbacks.append(callback)
+
     def start_watching(self):
         """Starts monitoring the configuration file in a background thread."""
         if self._observer_thread and self._observer_thread.is_alive():
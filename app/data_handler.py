@@ -1,10 +1,19 @@
-import json
 import logging
 import os
+import orjson # Faster JSON (de)serialisation for the posted articles file
 import fcntl # For file locking on POSIX systems (like Linux in Docker)
 
 logger = logging.getLogger(__name__)
 
+# orjson always writes UTF-8 (no ASCII escaping) and only supports 2-space indentation
+_JSON_WRITE_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+
+# --- In-memory Index of Posted Links ---
+# Maps filepath -> ((st_mtime_ns, st_size), frozenset of article URLs).
+# Scheduled runs only need membership checks, so the JSON file is re-parsed
+# only when it has changed on disk since the index was built.
+_posted_links_cache: dict[str, tuple[tuple[int, int], frozenset]] = {}
+
 def load_posted_articles(filepath: str) -> dict:
     """
     Loads the dictionary of posted articles from a JSON file.
@@ -22,17 +31,17 @@ def load_posted_articles(filepath: str) -> dict:
         return {}
     try:
         # Use 'with' for automatic file closing, even if errors occur
-        with open(filepath, 'r', encoding='utf-8') as f:
+        with open(filepath, 'rb') as f:
             # Acquire shared lock for reading - allows multiple readers
             fcntl.flock(f, fcntl.LOCK_SH)
             try:
-                data = json.load(f)
+                data = orjson.loads(f.read())
                 if not isinstance(data, dict):
                     logger.warning(f"Invalid data format in {filepath}. Expected dict, got {type(data)}. Returning empty dict.")
                     return {}
                 logger.debug(f"Loaded {len(data)} posted articles from {filepath}")
                 return data
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 logger.exception(f"Error decoding JSON from {filepath}. Returning empty dict.")
                 return {}
             finally:
@@ -46,6 +55,50 @@ def load_posted_articles(filepath: str) -> dict:
         return {}
 
 
+def get_posted_links(filepath: str) -> frozenset:
+    """
+    Returns the set of article URLs recorded in the posted articles file.
+    The set is built lazily and cached until the file's modification time or size changes.
+
+    Args:
+        filepath: The path to the JSON file.
+
+    Returns:
+        A frozenset of posted article URLs. Empty if the file doesn't exist or is invalid.
+    """
+    try:
+        file_stat = os.stat(filepath)
+    except FileNotFoundError:
+        _posted_links_cache.pop(filepath, None)
+        logger.info(f"Posted articles file not found at {filepath}. Returning empty set.")
+        return frozenset()
+    except OSError as e:
+        logger.error(f"Could not stat posted articles file {filepath}: {e}. Reloading without cache.")
+        return frozenset(load_posted_articles(filepath))
+
+    signature = (file_stat.st_mtime_ns, file_stat.st_size)
+    cached = _posted_links_cache.get(filepath)
+    if cached is not None and cached[0] == signature:
+        logger.debug(f"Using cached index of {len(cached[1])} posted links for {filepath}")
+        return cached[1]
+
+    links = frozenset(load_posted_articles(filepath))
+    _posted_links_cache[filepath] = (signature, links)
+    return links
+
+
+def _refresh_posted_links_cache(filepath: str, f, data: dict):
+    """Updates the cached link index after this process has rewritten the file, so the next run doesn't re-parse it."""
+    try:
+        f.flush()
+        file_stat = os.fstat(f.fileno())
+        _posted_links_cache[filepath] = ((file_stat.st_mtime_ns, file_stat.st_size), frozenset(data))
+    except OSError as e:
+        # Not fatal: the next get_posted_links() call will simply reload the file
+        _posted_links_cache.pop(filepath, None)
+        logger.debug(f"Could not refresh posted links cache for {filepath}: {e}")
+
+
 def add_posted_article(filepath: str, url: str, title: str, message_id: int | None, skipped: bool):
     """
     Adds a new article URL, title, message ID, and skipped status to the JSON file.
@@ -67,7 +120,7 @@ def add_posted_article(filepath: str, url: str, title: str, message_id: int | No
         # Best approach: read existing, modify, write back exclusively
         # Open with 'a' first to create if not exists, then reopen with 'r+'
         try:
-            with open(filepath, 'a', encoding='utf-8') as f:
+            with open(filepath, 'ab') as f:
                  # Ensure file exists, create if not. No lock needed here yet.
                  pass
         except IOError as e:
@@ -75,7 +128,7 @@ def add_posted_article(filepath: str, url: str, title: str, message_id: int | No
              return # Cannot proceed if file cannot be created/accessed
 
         # Now open for reading and writing with exclusive lock
-        with open(filepath, 'r+', encoding='utf-8') as f:
+        with open(filepath, 'r+b') as f:
             # Acquire exclusive lock (LOCK_EX). Blocks if another process holds EX or SH lock.
             # Use non-blocking (LOCK_NB) if you want to fail immediately instead of waiting.
             # Here, waiting (blocking) is acceptable.
@@ -84,11 +137,11 @@ def add_posted_article(filepath: str, url: str, title: str, message_id: int | No
                 # Read current data
                 f.seek(0) # Go to the beginning of the file
                 try:
-                    current_data = json.load(f)
+                    current_data = orjson.loads(f.read())
                     if not isinstance(current_data, dict):
                         logger.warning(f"Data in {filepath} is not a dict ({type(current_data)}). Overwriting with new entry.")
                         current_data = {}
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     logger.warning(f"Could not decode JSON from {filepath}. Starting fresh.")
                     current_data = {} # Start fresh if file is empty or corrupt
 
@@ -109,7 +162,8 @@ def add_posted_article(filepath: str, url: str, title: str, message_id: int | No
                 # Write updated data back
                 f.seek(0) # Go back to the beginning
                 f.truncate() # Clear the file content before writing
-                json.dump(current_data, f, ensure_ascii=False, indent=4) # Write with pretty print
+                f.write(orjson.dumps(current_data, option=_JSON_WRITE_OPTIONS)) # Write with pretty print
+                _refresh_posted_links_cache(filepath, f, current_data)
 
             except IOError as e:
                 logger.exception(f"IOError while writing to locked file {filepath}: {e}")
@@ -148,22 +202,22 @@ def add_posted_articles_batch(filepath: str, articles: list[dict]):
 
         # 确保文件存在
         try:
-            with open(filepath, 'a', encoding='utf-8') as f:
+            with open(filepath, 'ab') as f:
                 pass
         except IOError as e:
             logger.error(f"Could not ensure file exists at {filepath}: {e}")
             return
 
-        with open(filepath, 'r+', encoding='utf-8') as f:
+        with open(filepath, 'r+b') as f:
             fcntl.flock(f, fcntl.LOCK_EX)
             try:
                 f.seek(0)
                 try:
-                    current_data = json.load(f)
+                    current_data = orjson.loads(f.read())
                     if not isinstance(current_data, dict):
                         logger.warning(f"Data in {filepath} is not a dict. Overwriting.")
                         current_data = {}
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     logger.warning(f"Could not decode JSON from {filepath}. Starting fresh.")
                     current_data = {}
 
@@ -182,7 +236,8 @@ def add_posted_articles_batch(filepath: str, articles: list[dict]):
                 if added_count > 0:
                     f.seek(0)
                     f.truncate()
-                    json.dump(current_data, f, ensure_ascii=False, indent=4)
+                    f.write(orjson.dumps(current_data, option=_JSON_WRITE_OPTIONS))
+                    _refresh_posted_links_cache(filepath, f, current_data)
                     logger.info(f"Batch added {added_count} articles to {filepath}")
                 else:
                     logger.debug("All articles already exist, no write needed.")
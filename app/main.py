@@ -1,34 +1,42 @@
 import logging
 import asyncio
-import re
 import pytz
 from datetime import datetime
 from telegram import Bot, BotCommand
 from telegram.ext import Application, ApplicationBuilder
 
 # Import application modules
-from app import logger_setup, api_client, data_handler, telegram_poster, openai_translator
+from app import logger_setup, api_client, data_handler, telegram_poster, openai_translator, translation_cache
 from app.config import config_manager
 from app.stats_manager import increment_stat, reset_all_stats # Use convenience functions
 from app.bot_interface import setup_bot_handlers # Import the handler setup function
+from app.telegram_poster import escape_markdown_v2 # Shared, cached MarkdownV2 escaping
 # --- Setup ---
 logger_setup.setup_logging()
 logger = logging.getLogger(__name__)
 config_manager.log_loaded_config() # Log the loaded configuration via the manager
 
-# --- Telegram MarkdownV2 Escaping ---
-# Characters to escape: _ * [ ] ( ) ~ ` > # + - = | { } . !
-# Keep this here as run_check uses it for posting. bot_interface has its own copy.
-def escape_markdown_v2(text: str) -> str:
-    """Escapes text for Telegram MarkdownV2 parsing."""
-    if not isinstance(text, str):
-        return ""
-    # Ensure '.' and '!' are included as per Telegram MarkdownV2 spec
-    escape_chars = r'_*[]()~`>#+-=|{}.!'
-    # Use re.sub to escape characters: \[char]
-    return re.sub(f'([{re.escape(escape_chars)}])', r'\\\1', text)
 
 # --- Core Task ---
+async def _post_article(send_future: asyncio.Future, article_link: str, title: str, image_url: str | None) -> int | None:
+    """Waits for one queued post and updates the post stats. Returns the message ID, or None on failure."""
+    try:
+        message_id = await send_future
+    except Exception as e:
+        increment_stat("posts_fail")
+        logger.exception(f"Error posting message for {article_link} (Title: {title}): {e}")
+        return None
+
+    if message_id is None:
+        increment_stat("posts_fail")
+        logger.error(f"Failed to post article to Telegram (received None message_id): {article_link} (Title: {title}, Image URL: {image_url})")
+        flood_wait = telegram_poster.flood_wait_remaining()
+        if flood_wait > 0:
+            logger.warning(f"Telegram flood control active; remaining posts wait {flood_wait:.0f}s. This article will be retried next run.")
+        return None
+    increment_stat("posts_success")
+    return message_id
+
 async def run_check(bot: Bot):
     """Fetches news, translates new articles, and posts them to Telegram."""
     logger.info("Starting news check run...")
@@ -58,7 +66,7 @@ async def run_check(bot: Bot):
 
     # 2. Load already posted articles
     posted_articles_file = config_manager.get("posted_articles_file")
-    posted_articles = data_handler.load_posted_articles(posted_articles_file)
+    posted_articles = data_handler.get_posted_links(posted_articles_file)
     logger.debug(f"Loaded {len(posted_articles)} previously posted article URLs.")
 
     # 3. Identify new articles
@@ -74,9 +82,8 @@ async def run_check(bot: Bot):
 
     logger.info(f"Found {len(new_articles)} new articles to process.")
 
-    # 4. Process each new article
-    processed_count = 0
-    articles_to_save = []  # 收集要保存的文章，循环结束后批量写入
+    # 4. Fetch content for each new article
+    prepared_articles = [] # (article_link, original_title, content_data, original_body, main_image_url)
     for article in new_articles:
         article_link = article.get('link') # Use 'link' key
         if not article_link: # Skip if link is missing for some reason
@@ -110,24 +117,42 @@ async def run_check(bot: Bot):
             logger.warning(f"Could not get body content for {article_link}. Skipping article.")
             continue # Skip this article if body is not found
 
-        # 5. Translate Title, Body and Generate Hashtags using OpenAI
-        translation_result = None
-        try:
-            logger.debug(f"--> Calling OpenAI translator for: {article_link}")
-            translation_result = await openai_translator.translate_and_summarize_article(
-                title=original_title,
-                body=original_body
-            )
-            if translation_result:
-                increment_stat("translations_success")
-            else:
-                increment_stat("translations_fail")
-                logger.error(f"Failed to get translation/hashtags from OpenAI for {article_link}. Result: {'Success' if translation_result else 'Failure'}. Skipping article.")
-                continue # Skip this article if OpenAI call fails
-        except Exception as e:
+        prepared_articles.append((article_link, original_title, content_data, original_body, main_image_url))
+
+    if not prepared_articles:
+        logger.info("No new articles with usable content. Nothing to translate.")
+        return
+
+    # 5. Translate Titles, Bodies and Generate Hashtags using OpenAI
+    # Normally all articles are translated concurrently, with at most openai_max_concurrent_requests
+    # in flight. Backfills larger than openai_batch_threshold go through the (cheaper, slower) Batch API.
+    translation_items = [(original_title, original_body) for _, original_title, _, original_body, _ in prepared_articles]
+    batch_threshold = config_manager.get("openai_batch_threshold")
+    if batch_threshold and len(translation_items) > batch_threshold:
+        logger.info(f"{len(translation_items)} articles exceed openai_batch_threshold ({batch_threshold}). Translating via the OpenAI Batch API; this run waits for the batch to finish.")
+        translation_results = await openai_translator.translate_articles_batch(translation_items)
+    else:
+        logger.debug(f"--> Calling OpenAI translator for {len(prepared_articles)} articles")
+        translation_results = await openai_translator.translate_and_summarize_articles(
+            translation_items,
+            concurrency=config_manager.get("openai_max_concurrent_requests")
+        )
+
+    # Process each translated article
+    processed_count = 0
+    articles_to_save = []  # 收集要保存的文章，循环结束后批量写入
+    post_jobs = [] # (article_link, original_title, title, body, image_url) for articles to post
+    for (article_link, original_title, content_data, original_body, main_image_url), translation_result in zip(prepared_articles, translation_results):
+        if isinstance(translation_result, BaseException):
             increment_stat("translations_fail")
-            logger.exception(f"Error during OpenAI translation for {article_link}: {e}. Skipping article.")
+            logger.error(f"Error during OpenAI translation for {article_link}: {translation_result}. Skipping article.", exc_info=translation_result)
             continue
+        if translation_result:
+            increment_stat("translations_success")
+        else:
+            increment_stat("translations_fail")
+            logger.error(f"Failed to get translation/hashtags from OpenAI for {article_link}. Skipping article.")
+            continue # Skip this article if OpenAI call fails
 
         translated_title = translation_result.get('translated_title', '')
         translated_body = translation_result.get('translated_body', '')
@@ -181,96 +206,65 @@ async def run_check(bot: Bot):
             escaped_time = escape_markdown_v2(formatted_time_str)
 
             # --- Assemble Message Components ---
-            title_part = f"*{escaped_title}*\n\n"
-            content_part = f"{escaped_content}\n\n" if escaped_content else ""
-            link_part = f"[原文链接]({article_link})"
-            time_part = f"\n_{escaped_time}_" if escaped_time else ""
-
-            hashtags_part = ""
-            if hashtags:
-                valid_hashtags = [f"#{tag.lstrip('#')}" for tag in hashtags if isinstance(tag, str) and tag]
-                if valid_hashtags:
-                    escaped_tags = [escape_markdown_v2(tag) for tag in valid_hashtags]
-                    hashtags_part = "\n\n" + " ".join(escaped_tags)
+            # Normalise each hashtag to a single leading '#' and escape it in one pass
+            escaped_tags = [
+                escape_markdown_v2(f"#{tag.lstrip('#')}")
+                for tag in hashtags if isinstance(tag, str) and tag
+            ]
 
             # --- Construct Final Message Components for telegram_poster ---
             # The telegram_poster.post_message function will handle final assembly and truncation.
-            # title_part is f"*{escaped_title}*\n\n"
-            # content_part is f"{escaped_content}\n\n" or ""
-            # link_part is f"[原文链接]({article_link})"
-            # time_part is f"\n_{escaped_time}_" or ""
-            # hashtags_part is f"\n\n" + " ".join(escaped_tags) or ""
-
             title_for_telegram_poster = f"*{escaped_title}*" # Pure title, Markdown formatted
 
-            body_for_telegram_poster = ""
+            # Collect the body lines and join once at the end instead of growing the string with +=.
+            # Resulting layout: content, blank line, link, time (italic), blank line, hashtags.
+            body_parts = []
             if escaped_content: # This is the main body of the article
-                body_for_telegram_poster += escaped_content
-            
-            # Add link_part, ensuring separation
-            if body_for_telegram_poster:
-                body_for_telegram_poster += f"\n\n{link_part}"
-            else:
-                body_for_telegram_poster += link_part # If no content, link is first
-            
-            # time_part already starts with \n if it exists and is not empty
-            if time_part: # time_part is f"\n_{escaped_time}_"
-                body_for_telegram_poster += time_part
-            
-            # hashtags_part already starts with \n\n if it exists and is not empty
-            if hashtags_part: # hashtags_part is f"\n\n{escaped_tags_joined}"
-                body_for_telegram_poster += hashtags_part
-            
-            # The old 'message' variable is no longer the primary source for posting.
-            # We use title_for_telegram_poster and body_for_telegram_poster.
-
-        # 7. Post to Telegram (conditionally)
-        message_id = None
-        post_success = False
-        if not should_skip:
-            # Check if there's a title to post, as it's essential.
-            if title_for_telegram_poster:
-                logger.debug(f"Preparing to send to Telegram. Title: '{title_for_telegram_poster}'. Body: '{body_for_telegram_poster}'. Image: {main_image_url}")
-                try:
-                    # Pass the bot instance, title, body, and image_url
-                    message_id = await telegram_poster.post_message(
-                        bot,
-                        title=title_for_telegram_poster,
-                        body=body_for_telegram_poster,
-                        image_url=main_image_url
-                    )
-                    if message_id is not None:
-                        increment_stat("posts_success")
-                        post_success = True
-                    else:
-                        increment_stat("posts_fail")
-                        logger.error(f"Failed to post article to Telegram (received None message_id): {article_link} (Title: {title_for_telegram_poster}, Image URL: {main_image_url})")
-                except Exception as e:
-                    increment_stat("posts_fail")
-                    logger.exception(f"Error posting message for {article_link} (Title: {title_for_telegram_poster}): {e}")
-            else:
-                 increment_stat("posts_fail") # Count as failure if title is empty
-                 logger.error(f"Formatted title is empty for {article_link}. Cannot post.")
-        # If should_skip is True, message_id remains None, post_success remains False
-
-        # 8. Update posted articles file (conditionally)
-        # Only add if skipped OR if posting was attempted and successful
-        if should_skip or post_success:
-            logger.debug(f"Adding article to posted list. Skipped: {should_skip}, Message ID: {message_id}, URL: {article_link}")
+                body_parts += [escaped_content, ""]
+            body_parts.append(f"[原文链接]({article_link})")
+            if escaped_time:
+                body_parts.append(f"_{escaped_time}_")
+            if escaped_tags:
+                body_parts += ["", " ".join(escaped_tags)]
+            body_for_telegram_poster = "\n".join(body_parts)
+
+        # 7. Queue the post (skipped articles are recorded right away)
+        if should_skip:
+            logger.debug(f"Adding skipped article to posted list. URL: {article_link}")
             articles_to_save.append({
                 'url': article_link,
                 'title': original_title,
-                'message_id': message_id,
-                'skipped': should_skip
+                'message_id': None,
+                'skipped': True
             })
-        elif not should_skip and not post_success:
+        else:
+            post_jobs.append((article_link, original_title, title_for_telegram_poster, body_for_telegram_poster, main_image_url))
+
+    # 8. Post to Telegram
+    # Posts are handed to telegram_poster's send queue in ranking order; its sender workers
+    # (telegram_max_concurrent_posts of them) send them under the rate limiters.
+    send_futures = []
+    for article_link, _, title, body, image_url in post_jobs:
+        logger.debug(f"Queueing for Telegram. Title: '{title}'. Body: '{body}'. Image: {image_url}")
+        send_futures.append(await telegram_poster.enqueue_message(title, body, image_url))
+    message_ids = await asyncio.gather(*(
+        _post_article(send_future, article_link, title, image_url)
+        for send_future, (article_link, _, title, _, image_url) in zip(send_futures, post_jobs)
+    ))
+
+    # Only add successfully posted articles; failed ones are retried next run
+    for (article_link, original_title, _, _, _), message_id in zip(post_jobs, message_ids):
+        if message_id is None:
             logger.warning(f"Article posting failed and was not skipped. NOT adding to posted list. URL: {article_link}")
-
-        if post_success:
-             processed_count += 1 # Increment only if successfully posted
-
-        # A small delay between processing articles within a run
-        await asyncio.sleep(5) # Keep the 5-second delay
+            continue
+        logger.debug(f"Adding article to posted list. Message ID: {message_id}, URL: {article_link}")
+        articles_to_save.append({
+            'url': article_link,
+            'title': original_title,
+            'message_id': message_id,
+            'skipped': False
+        })
+        processed_count += 1 # Increment only if successfully posted
 
     # 9. 批量写入所有处理过的文章
     if articles_to_save:
@@ -292,14 +286,24 @@ async def scheduled_news_check(application: Application):
     # Run once immediately at startup after a short delay to allow bot connection
     logger.info("Running initial news check shortly after startup...")
     await asyncio.sleep(10) # Wait 10 seconds before first check
+    loop = asyncio.get_running_loop()
+    next_run_time = loop.time()
     try:
         await run_check(application.bot)
     except Exception as e:
         logger.exception("Error during initial news check run.")
 
-    # Then run in a loop
+    # Then run in a loop at a fixed rate on the shared event loop: time spent inside
+    # run_check counts towards the interval instead of being added on top of it.
     while True:
-        await asyncio.sleep(interval_seconds)
+        next_run_time += interval_seconds
+        delay = next_run_time - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            # The previous run overran the interval; start now and re-anchor instead of catching up
+            logger.warning(f"Previous news check overran the {interval_minutes} min interval by {-delay:.0f}s. Running next check immediately.")
+            next_run_time = loop.time()
         logger.info(f"Scheduled interval ({interval_minutes} min) elapsed. Running news check...")
         try:
             await run_check(application.bot)
@@ -320,7 +324,17 @@ async def main():
 
     # Build the Telegram Application
     logger.info("Building Telegram application...")
-    application = ApplicationBuilder().token(bot_token).build()
+    # application.bot is shared by command replies and every channel post. Its HTTPXRequest
+    # keeps the builder's default keep-alive pool; the read timeout is raised because
+    # send_photo with a URL waits for Telegram to download the image.
+    application = (
+        ApplicationBuilder()
+        .token(bot_token)
+        .connect_timeout(telegram_poster.TELEGRAM_CONNECT_TIMEOUT)
+        .read_timeout(telegram_poster.TELEGRAM_READ_TIMEOUT)
+        .pool_timeout(telegram_poster.TELEGRAM_POOL_TIMEOUT)
+        .build()
+    )
 
     # Add command handlers (e.g., /stats)
     setup_bot_handlers(application)
@@ -349,6 +363,9 @@ async def main():
                 logger.error(f"Failed to set bot commands: {e}")
             # --- End Set Bot Commands ---
 
+            # Start the Telegram send queue workers used by the news check
+            telegram_poster.start_sender(application.bot, workers=config_manager.get("telegram_max_concurrent_posts"))
+
             # Create and run the background news check task
             news_check_task = asyncio.create_task(scheduled_news_check(application))
             logger.info("Application started successfully. Waiting for tasks...")
@@ -363,10 +380,19 @@ async def main():
         logger.exception(f"An unexpected error occurred in the main execution: {e}")
     finally:
         logger.info("Starting shutdown process...")
+        # Stop the Telegram sender workers (posts still queued are retried next run)
+        await telegram_poster.stop_sender()
+
         # Stop the configuration watcher
         logger.info("Stopping configuration file watcher...")
         config_manager.stop_watching()
 
+        # Close shared HTTP clients
+        await api_client.close_session()
+        await openai_translator.close_clients()
+        await telegram_poster.shutdown()
+        translation_cache.close()
+
         # Application shutdown is handled by 'async with application:' context manager
         # It calls application.stop(), application.updater.stop(), application.shutdown()
 
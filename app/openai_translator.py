@@ -1,16 +1,107 @@
 import logging
-import json
+import asyncio
+import functools
+import re
+import aiohttp
+import httpx
+import orjson
+from types import SimpleNamespace
 from openai import AsyncOpenAI, OpenAIError # Use AsyncOpenAI for async operations
 from .config import config_manager
+from . import translation_cache
 
 logger = logging.getLogger(__name__)
 
-# --- OpenAI Client Initialization (Removed) ---
-# Client will be initialized dynamically within the function call
-# to ensure latest configuration is used.
+# --- Cached Settings ---
+@functools.lru_cache(maxsize=1)
+def _openai_cfg() -> SimpleNamespace:
+    """Returns a snapshot of the OpenAI settings, cached until the next config reload."""
+    return SimpleNamespace(
+        api_key=config_manager.get("openai_api_key"),
+        base_url=config_manager.get("openai_api_base_url"), # Can be None
+        model=config_manager.get("openai_model"),
+        temperature=config_manager.get("openai_temperature"),
+        max_tokens=config_manager.get("openai_max_tokens"),
+        use_direct_http=config_manager.get("openai_use_direct_http"),
+        cache_file=config_manager.get("translation_cache_file"),
+        cache_ttl_seconds=config_manager.get("translation_cache_ttl_hours") * 3600,
+    )
+
+config_manager.register_reload_callback(_openai_cfg.cache_clear)
+
+# --- OpenAI Client Cache ---
+# Clients are reused across calls so their HTTP connection pool (and keep-alive
+# connections to the API) survives between translations. Keyed by (api_key, base_url)
+# so a config reload that changes either value transparently gets a new client.
+_client_cache: dict[tuple[str, str | None], AsyncOpenAI] = {}
+
+# All cached clients share one httpx.AsyncClient with pool limits sized for
+# concurrent translations (httpx's defaults keep only a handful of idle connections).
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+_HTTP_TIMEOUT = httpx.Timeout(60.0)
+_http_client: httpx.AsyncClient | None = None
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Returns the shared httpx client used by all OpenAI clients, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    return _http_client
+
+def _get_async_client(api_key: str, base_url: str | None) -> AsyncOpenAI:
+    """Returns a cached AsyncOpenAI client for the given credentials, creating it if needed."""
+    cache_key = (api_key, base_url)
+    client = _client_cache.get(cache_key)
+    if client is None:
+        client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=_get_http_client())
+        _client_cache[cache_key] = client
+        logger.debug("Created new OpenAI client (Base URL: %s). Instance ID: %d", base_url or 'default', id(client))
+    return client
+
+async def close_clients():
+    """Closes the shared HTTP client and drops cached OpenAI clients. Call once on application shutdown."""
+    global _http_client
+    _client_cache.clear()
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+        logger.info("Closed shared OpenAI HTTP client.")
+    _http_client = None
+    await _close_direct_session()
+
+# --- Direct HTTP Transport (optional, `openai_use_direct_http`) ---
+# Posts chat completions straight to `{base_url}/chat/completions` with aiohttp and
+# parses the JSON body with orjson, skipping the SDK's request/response model layer.
+# The SDK path remains the default, and is used as a fallback when an endpoint
+# doesn't expose the plain chat completions route.
+DEFAULT_OPENAI_BASE_URL = "https://api.openai.com/v1"
+_direct_session: aiohttp.ClientSession | None = None
+
+class _DirectEndpointUnavailable(Exception):
+    """Raised when the configured endpoint has no /chat/completions route (404/405)."""
+
+def _get_direct_session() -> aiohttp.ClientSession:
+    """Returns the shared aiohttp session for direct requests, creating it on first use."""
+    global _direct_session
+    if _direct_session is None or _direct_session.closed:
+        _direct_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=60)
+        )
+        logger.debug("Created shared aiohttp ClientSession for direct OpenAI requests.")
+    return _direct_session
+
+async def _close_direct_session():
+    """Closes the direct-request session, if one was opened."""
+    global _direct_session
+    if _direct_session is not None and not _direct_session.closed:
+        await _direct_session.close()
+        logger.info("Closed direct OpenAI aiohttp session.")
+    _direct_session = None
 
 # --- Prompt Definition ---
 # Define the prompt directly in the code as requested
+# Keep this a static constant (never format values into it): an identical prefix on
+# every request lets models with prompt caching bill it as cached input tokens.
 TRANSLATION_SYSTEM_PROMPT = """
 You are a helpful assistant tasked with translating Japanese news articles into Chinese
 and generating relevant hashtags.
@@ -35,6 +126,61 @@ Example Output JSON:
 Ensure the output is ONLY the JSON object and nothing else. Note that the markdown style json is NOT allowed.
 """
 
+# Bump whenever TRANSLATION_SYSTEM_PROMPT (or the expected output format) changes,
+# so cached translations produced by the old prompt are no longer used.
+PROMPT_VERSION = 1
+
+# Combined title + body length above which an article is rejected without calling the API
+# (far beyond a normal news article; such inputs would only fail or be truncated by max_tokens)
+MAX_INPUT_CHARS = 20000
+
+# Matches from the first '{' to the last '}' in a response
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+def _build_messages(title: str, body: str) -> list[dict]:
+    """Builds the chat messages for translating one article."""
+    # Construct the user message content for the API call
+    user_content = f"###Title###: {title}\n###Body###: {body}"
+    return [
+        {"role": "system", "content": TRANSLATION_SYSTEM_PROMPT},
+        {"role": "user", "content": user_content}
+    ]
+
+def _parse_translation_response(response_content: str) -> dict | None:
+    """
+    Extracts and validates the translation JSON object from a model response.
+
+    Returns:
+        The parsed dictionary with 'translated_title', 'translated_body' and 'hashtags',
+        or None if the content is not valid JSON of the expected shape.
+    """
+    try:
+        # The response might be wrapped in markdown ```json ... ```; take the outermost {...} span
+        json_match = _JSON_OBJECT_RE.search(response_content)
+        if not json_match:
+            logger.error(f"OpenAI response does not contain a JSON object: {response_content[:200]}...")
+            return None
+
+        result_data = orjson.loads(json_match.group(0))
+
+        # Validate the structure of the parsed JSON
+        if not isinstance(result_data, dict) or \
+           'translated_title' not in result_data or \
+           'translated_body' not in result_data or \
+           'hashtags' not in result_data or \
+           not isinstance(result_data['hashtags'], list):
+            logger.error(f"Invalid JSON structure received from OpenAI: {result_data}")
+            return None
+
+        return result_data
+
+    except orjson.JSONDecodeError:
+        logger.exception(f"Failed to decode JSON response from OpenAI. Response: {response_content[:500]}")
+        return None
+    except Exception as e: # Catch other potential parsing errors
+         logger.exception(f"Error processing OpenAI JSON response: {e}. Response: {response_content[:500]}")
+         return None
+
 async def translate_and_summarize_article(title: str, body: str) -> dict | None:
     """
     Translates article title and body to Chinese and generates hashtags using OpenAI.
@@ -47,12 +193,21 @@ async def translate_and_summarize_article(title: str, body: str) -> dict | None:
         A dictionary with 'translated_title', 'translated_body', and 'hashtags'
         if successful, None otherwise.
     """
-    # --- Fetch Config and Initialize Client ---
-    api_key = config_manager.get("openai_api_key")
-    base_url = config_manager.get("openai_api_base_url") # Can be None
-    model = config_manager.get("openai_model")
-    temperature = config_manager.get("openai_temperature")
-    max_tokens = config_manager.get("openai_max_tokens")
+    # --- Cheap Input Checks (before any config lookups or I/O) ---
+    if not title and not body:
+        logger.warning("translate_and_summarize_article called with empty title and body.")
+        # Return a structure indicating no translation needed or possible?
+        # For now, return None as it's likely an issue upstream.
+        return None
+    input_length = len(title or "") + len(body or "")
+    if input_length > MAX_INPUT_CHARS:
+        logger.warning(f"Article is too long to translate ({input_length} chars, limit {MAX_INPUT_CHARS}). Title: {title[:50]}...")
+        return None
+
+    # --- Fetch Config ---
+    cfg = _openai_cfg()
+    api_key, base_url, model = cfg.api_key, cfg.base_url, cfg.model
+    temperature, max_tokens = cfg.temperature, cfg.max_tokens
 
     if not api_key:
         logger.error("OpenAI API Key is not configured. Cannot perform translation.")
@@ -61,109 +216,326 @@ async def translate_and_summarize_article(title: str, body: str) -> dict | None:
          logger.error("OpenAI Model is not configured. Cannot perform translation.")
          return None
 
-    client = None # Initialize client to None
+    # --- Check Translation Cache ---
+    cache_file, cache_ttl_seconds = cfg.cache_file, cfg.cache_ttl_seconds
+    cache_key = None
+    if cache_file:
+        cache_key = translation_cache.make_cache_key(model, PROMPT_VERSION, title, body)
+        cached_result = await translation_cache.get_cached_translation(cache_file, cache_key, cache_ttl_seconds)
+        if cached_result is not None:
+            logger.info(f"Using cached translation for title: {title[:50]}...")
+            return cached_result
+
+    logger.debug("Sending request to OpenAI for title: %.50s...", title)
     try:
-        client = AsyncOpenAI(api_key=api_key, base_url=base_url)
-        logger.debug(f"OpenAI client CREATED for request (Title: {title[:20]}...). Instance ID: {id(client)}") # Log creation
+        response_content = None
+        use_sdk = True
+        if cfg.use_direct_http:
+            try:
+                response_content = await _request_completion_direct(api_key, base_url, model, temperature, max_tokens, title, body)
+                use_sdk = False
+            except _DirectEndpointUnavailable as e:
+                logger.warning(f"{e} Falling back to the OpenAI SDK.")
+        if use_sdk:
+            response_content = await _request_completion_sdk(api_key, base_url, model, temperature, max_tokens, title, body)
+        if response_content is None:
+            return None
+
+        logger.debug("Raw OpenAI response: %.200s...", response_content) # Log snippet
+
+        result_data = _parse_translation_response(response_content)
+        if result_data is None:
+            logger.debug("OpenAI function EXITING AFTER PARSE ERROR (Title: %.20s...).", title) # Log exit
+            return None
+
+        logger.debug("OpenAI function EXITING NORMALLY (Title: %.20s...).", title) # Log normal exit
+        logger.info(f"Successfully translated and generated hashtags for title: {title[:50]}...")
+        if cache_key:
+            await translation_cache.store_translation(cache_file, cache_key, result_data)
+        return result_data
+
     except OpenAIError as e:
-        logger.exception(f"Failed to initialize OpenAI client for request: {e}")
+        logger.exception(f"OpenAI API error during translation: {e}")
+        logger.debug("OpenAI function EXITING AFTER API ERROR (Title: %.20s...).", title) # Log exit
+        return None
+    except Exception as e:
+        logger.exception(f"An unexpected error occurred during OpenAI call: {e}")
+        logger.debug("OpenAI function EXITING AFTER UNEXPECTED ERROR (Title: %.20s...).", title) # Log exit
         return None
-    # Note: No explicit client.aclose() here
 
-    if not title and not body:
-        logger.warning("translate_and_summarize_article called with empty title and body.")
-        # Return a structure indicating no translation needed or possible?
-        # For now, return None as it's likely an issue upstream.
+
+async def _request_completion_sdk(api_key: str, base_url: str | None, model: str, temperature: float,
+                                  max_tokens: int, title: str, body: str) -> str | None:
+    """
+    Requests a translation through the OpenAI SDK, streaming the completion.
+
+    Returns:
+        The response content, or None if the model refused or returned nothing.
+        OpenAIError is propagated to the caller.
+    """
+    client = _get_async_client(api_key, base_url)
+    # Usage reporting in the stream is only requested from OpenAI itself: many OpenAI-compatible
+    # endpoints reject unknown stream_options with a 400, and usage is only logged at DEBUG
+    extra_options = {}
+    if base_url is None or base_url.rstrip('/') == DEFAULT_OPENAI_BASE_URL:
+        extra_options["stream_options"] = {"include_usage": True} # Final chunk carries token usage
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=_build_messages(title, body),
+        temperature=temperature,
+        max_tokens=max_tokens,
+        # Request JSON response format if supported by the model/API version
+        # Note: This might require specific model versions (e.g., gpt-4-1106-preview)
+        response_format={"type": "json_object"}, # Enforce JSON output mode
+        # Stream the completion so the body arrives incrementally instead of in one block at the end
+        stream=True,
+        **extra_options
+    )
+
+    # Accumulate the streamed content with robust null checks
+    content_parts = []
+    refusal_parts = []
+    finish_reason = 'unknown'
+    usage = None
+    async for chunk in stream:
+        if getattr(chunk, 'usage', None) is not None:
+            usage = chunk.usage
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            finish_reason = choice.finish_reason
+        delta = choice.delta
+        if delta is None:
+            continue
+        if delta.content:
+            content_parts.append(delta.content)
+        # Check for refusal (some APIs set this when content is filtered)
+        refusal = getattr(delta, 'refusal', None)
+        if refusal:
+            refusal_parts.append(refusal)
+
+    # Log token usage, including prompt tokens served from OpenAI's prompt cache
+    if usage is not None:
+        prompt_details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = getattr(prompt_details, 'cached_tokens', None) or 0
+        logger.debug("OpenAI usage: prompt_tokens=%s (cached: %s), completion_tokens=%s", usage.prompt_tokens, cached_tokens, usage.completion_tokens)
+
+    if refusal_parts:
+        logger.error(f"OpenAI refused to respond: {''.join(refusal_parts)}, title: {title[:50]}...")
         return None
 
-    # Construct the user message content for the API call
-    user_content = f"###Title###: {title}\n###Body###: {body}"
+    response_content = "".join(content_parts)
+    if not response_content:
+        logger.error(f"OpenAI response content is empty. finish_reason: {finish_reason}, title: {title[:50]}...")
+        return None
+    return response_content
+
+
+async def _request_completion_direct(api_key: str, base_url: str | None, model: str, temperature: float,
+                                     max_tokens: int, title: str, body: str) -> str | None:
+    """
+    Requests a translation with a plain aiohttp POST to the chat completions endpoint.
+
+    Returns:
+        The response content, or None on HTTP/transport errors, refusals or empty responses.
 
-    logger.debug(f"Sending request to OpenAI for title: {title[:50]}...")
+    Raises:
+        _DirectEndpointUnavailable: If the endpoint answers 404/405, so the caller can use the SDK instead.
+    """
+    url = f"{(base_url or DEFAULT_OPENAI_BASE_URL).rstrip('/')}/chat/completions"
+    payload = {
+        "model": model,
+        "messages": _build_messages(title, body),
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "response_format": {"type": "json_object"},
+    }
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+
+    session = _get_direct_session()
     try:
-        response = await client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": TRANSLATION_SYSTEM_PROMPT},
-                {"role": "user", "content": user_content}
-            ],
-            temperature=temperature,
-            max_tokens=max_tokens,
-            # Request JSON response format if supported by the model/API version
-            # Note: This might require specific model versions (e.g., gpt-4-1106-preview)
-            response_format={"type": "json_object"} # Enforce JSON output mode
-        )
+        async with session.post(url, data=orjson.dumps(payload), headers=headers) as response:
+            raw_body = await response.read()
+            status = response.status
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Direct OpenAI request to {url} failed: {e}")
+        return None
 
-        # Extract the response content with robust null checks
-        if not response.choices:
-            logger.error(f"OpenAI response has no choices. Full response: {response}")
-            return None
+    if status in (404, 405):
+        raise _DirectEndpointUnavailable(f"Endpoint {url} returned HTTP {status}.")
+    if status != 200:
+        logger.error(f"Direct OpenAI request to {url} returned HTTP {status}: {raw_body[:500]!r}")
+        return None
 
-        choice = response.choices[0]
-        finish_reason = getattr(choice, 'finish_reason', 'unknown')
+    try:
+        data = orjson.loads(raw_body)
+    except orjson.JSONDecodeError:
+        logger.error(f"Direct OpenAI response is not valid JSON: {raw_body[:500]!r}")
+        return None
 
-        if choice.message is None:
-            logger.error(f"OpenAI response message is None. finish_reason: {finish_reason}, title: {title[:50]}...")
-            return None
+    # Log token usage, including prompt tokens served from OpenAI's prompt cache
+    usage = data.get("usage") or {}
+    if usage:
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+        logger.debug("OpenAI usage: prompt_tokens=%s (cached: %s), completion_tokens=%s", usage.get('prompt_tokens'), cached_tokens, usage.get('completion_tokens'))
 
-        # Check for refusal (some APIs set this when content is filtered)
-        if hasattr(choice.message, 'refusal') and choice.message.refusal:
-            logger.error(f"OpenAI refused to respond: {choice.message.refusal}, title: {title[:50]}...")
-            return None
+    choices = data.get("choices") or []
+    choice = choices[0] if choices else {}
+    message = choice.get("message") or {}
+    if message.get("refusal"):
+        logger.error(f"OpenAI refused to respond: {message['refusal']}, title: {title[:50]}...")
+        return None
 
-        response_content = choice.message.content
-        if not response_content:
-            logger.error(f"OpenAI response content is empty. finish_reason: {finish_reason}, title: {title[:50]}...")
-            return None
+    response_content = message.get("content")
+    if not response_content:
+        logger.error(f"OpenAI response content is empty. finish_reason: {choice.get('finish_reason', 'unknown')}, title: {title[:50]}...")
+        return None
+    return response_content
 
-        logger.debug(f"Raw OpenAI response: {response_content[:200]}...") # Log snippet
 
-        # Parse the JSON response
-        try:
-            # The response might contain markdown ```json ... ```, try to extract JSON part
-            json_str = response_content.strip()
-            if json_str.startswith("```json"):
-                # Find the first '{' and the last '}' to extract the JSON object
-                start_index = json_str.find('{')
-                end_index = json_str.rfind('}')
-                if start_index != -1 and end_index != -1 and start_index < end_index:
-                    json_str = json_str[start_index:end_index+1]
-                else:
-                    logger.error(f"Could not extract JSON object from markdown block: {response_content[:200]}...")
-                    return None
-            elif not json_str.startswith("{"):
-                 logger.error(f"OpenAI response does not appear to be JSON: {response_content[:200]}...")
-                 return None
-
-            result_data = json.loads(json_str)
-
-            # Validate the structure of the parsed JSON
-            if not isinstance(result_data, dict) or \
-               'translated_title' not in result_data or \
-               'translated_body' not in result_data or \
-               'hashtags' not in result_data or \
-               not isinstance(result_data['hashtags'], list):
-                logger.error(f"Invalid JSON structure received from OpenAI: {result_data}")
-                return None
-
-            logger.debug(f"OpenAI function EXITING NORMALLY (Title: {title[:20]}...). Instance ID: {id(client)}") # Log normal exit
-            logger.info(f"Successfully translated and generated hashtags for title: {title[:50]}...")
-            return result_data
-
-        except json.JSONDecodeError:
-            logger.exception(f"Failed to decode JSON response from OpenAI. Response: {response_content[:500]}")
-            logger.debug(f"OpenAI function EXITING AFTER JSON ERROR (Title: {title[:20]}...). Instance ID: {id(client)}") # Log exit
-            return None
-        except Exception as e: # Catch other potential parsing errors
-             logger.exception(f"Error processing OpenAI JSON response: {e}. Response: {response_content[:500]}")
-             logger.debug(f"OpenAI function EXITING AFTER OTHER PARSE ERROR (Title: {title[:20]}...). Instance ID: {id(client)}") # Log exit
-             return None
+async def translate_and_summarize_articles(items: list[tuple[str, str]], concurrency: int = 5) -> list:
+    """
+    Translates several articles concurrently, keeping at most `concurrency` OpenAI requests in flight.
+
+    Args:
+        items: A list of (title, body) tuples.
+        concurrency: Maximum number of simultaneous translation requests.
+
+    Returns:
+        A list aligned with `items`. Each element is the result of
+        translate_and_summarize_article (a dict or None), or the exception it raised.
+    """
+    # Sweep expired cache entries once per run instead of on every write
+    cfg = _openai_cfg()
+    if cfg.cache_file:
+        await translation_cache.evict_expired(cfg.cache_file, cfg.cache_ttl_seconds)
 
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _translate_one(title: str, body: str) -> dict | None:
+        async with semaphore:
+            return await translate_and_summarize_article(title, body)
+
+    return await asyncio.gather(*(_translate_one(title, body) for title, body in items), return_exceptions=True)
+
+
+# --- OpenAI Batch API (Backfills) ---
+# Batch jobs are billed at a discount and have their own rate limits, but complete
+# asynchronously within a 24h window. Use them for non-interactive catch-up runs only.
+_BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+async def translate_articles_batch(items: list[tuple[str, str]], poll_interval_seconds: float = 60.0) -> list[dict | None]:
+    """
+    Translates articles through the OpenAI Batch API and waits for the batch to finish.
+
+    Intended for backfills where the latency of individual posts doesn't matter.
+    Successful results are also written to the translation cache, so a later
+    scheduled run picks them up without calling the API again.
+
+    Args:
+        items: A list of (title, body) tuples.
+        poll_interval_seconds: How often to check the batch status.
+
+    Returns:
+        A list aligned with `items`; each element is the result dictionary or None
+        if that article could not be translated.
+    """
+    results: list[dict | None] = [None] * len(items)
+    if not items:
+        return results
+
+    cfg = _openai_cfg()
+    api_key, base_url, model = cfg.api_key, cfg.base_url, cfg.model
+    temperature, max_tokens = cfg.temperature, cfg.max_tokens
+
+    if not api_key or not model:
+        logger.error("OpenAI API Key or Model is not configured. Cannot submit translation batch.")
+        return results
+
+    # One /v1/chat/completions request per article; custom_id is the index into `items`
+    request_lines = []
+    for index, (title, body) in enumerate(items):
+        request_lines.append(orjson.dumps({
+            "custom_id": str(index),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": _build_messages(title, body),
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "response_format": {"type": "json_object"},
+            },
+        }))
+    batch_input = b"\n".join(request_lines) + b"\n"
+
+    file_ids = [] # Uploaded input and generated output/error files, deleted once the batch is done
+    try:
+        client = _get_async_client(api_key, base_url)
+        input_file = await client.files.create(file=("translations.jsonl", batch_input), purpose="batch")
+        file_ids.append(input_file.id)
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted OpenAI translation batch {batch.id} with {len(items)} articles.")
+
+        while batch.status not in _BATCH_TERMINAL_STATUSES:
+            await asyncio.sleep(poll_interval_seconds)
+            batch = await client.batches.retrieve(batch.id)
+            logger.debug("Translation batch %s status: %s", batch.id, batch.status)
+        file_ids.extend(file_id for file_id in (batch.output_file_id, batch.error_file_id) if file_id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error(f"Translation batch {batch.id} finished with status '{batch.status}' and no output file.")
+            return results
+
+        output = await client.files.content(batch.output_file_id)
+        output_text = output.text
     except OpenAIError as e:
-        logger.exception(f"OpenAI API error during translation: {e}")
-        logger.debug(f"OpenAI function EXITING AFTER API ERROR (Title: {title[:20]}...). Instance ID: {id(client)}") # Log exit
-        return None
-    except Exception as e:
-        logger.exception(f"An unexpected error occurred during OpenAI call: {e}")
-        logger.debug(f"OpenAI function EXITING AFTER UNEXPECTED ERROR (Title: {title[:20]}...). Instance ID: {id(client)}") # Log exit
-        return None
\ No newline at end of file
+        logger.exception(f"OpenAI API error during batch translation: {e}")
+        return results
+    finally:
+        # Don't leave batch files behind on the account after every backfill
+        for file_id in file_ids:
+            try:
+                await client.files.delete(file_id)
+            except OpenAIError as e:
+                logger.warning(f"Could not delete OpenAI batch file {file_id}: {e}")
+
+    cache_file = cfg.cache_file
+    if cache_file:
+        await translation_cache.evict_expired(cache_file, cfg.cache_ttl_seconds)
+    for line in output_text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = orjson.loads(line)
+            index = int(record["custom_id"])
+            title, body = items[index]
+        except (orjson.JSONDecodeError, KeyError, ValueError, IndexError) as e:
+            logger.error(f"Skipping malformed line in batch output: {e}. Line: {line[:200]}...")
+            continue
+
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            logger.error(f"Batch request for article {index} failed: {record.get('error') or response.get('status_code')}")
+            continue
+        choices = (response.get("body") or {}).get("choices") or []
+        response_content = (choices[0].get("message") or {}).get("content") if choices else None
+        if not response_content:
+            logger.error(f"Batch response for article {index} has no content (title: {title[:50]}...).")
+            continue
+
+        result_data = _parse_translation_response(response_content)
+        if result_data is None:
+            continue
+        results[index] = result_data
+        if cache_file:
+            cache_key = translation_cache.make_cache_key(model, PROMPT_VERSION, title, body)
+            await translation_cache.store_translation(cache_file, cache_key, result_data)
+
+    logger.info(f"Translation batch {batch.id} done: {sum(r is not None for r in results)}/{len(items)} articles translated.")
+    return results
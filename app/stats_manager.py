@@ -1,10 +1,9 @@
 import logging
-import threading
-from dataclasses import dataclass, field
+from dataclasses import dataclass, fields
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class Stats:
     """Data class to hold runtime statistics."""
     fetches_success: int = 0
@@ -15,37 +14,34 @@ class Stats:
     posts_fail: int = 0
     skips_keyword: int = 0
 
+# Names of all counters, in field order
+STAT_NAMES = tuple(f.name for f in fields(Stats))
+
 class StatsManager:
     """Manages runtime statistics for the bot."""
 
     def __init__(self):
-        self._stats = Stats()
-        # Using a lock to ensure thread-safety if stats are accessed/modified
-        # from different async tasks or threads concurrently.
-        self._lock = threading.Lock()
+        # Counters live in a plain dict keyed by Stats field name. All updates happen
+        # on the asyncio event loop thread, so no lock is needed around the increments.
+        self._counts: dict[str, int] = dict.fromkeys(STAT_NAMES, 0)
         logger.info("Statistics Manager initialized.")
 
     def increment(self, stat_name: str):
-        """Increments a specific statistic counter safely."""
-        with self._lock:
-            if hasattr(self._stats, stat_name):
-                current_value = getattr(self._stats, stat_name)
-                setattr(self._stats, stat_name, current_value + 1)
-                # logger.debug(f"Incremented stat '{stat_name}' to {current_value + 1}")
-            else:
-                logger.warning(f"Attempted to increment non-existent stat: {stat_name}")
+        """Increments a specific statistic counter."""
+        try:
+            self._counts[stat_name] += 1
+        except KeyError:
+            logger.warning(f"Attempted to increment non-existent stat: {stat_name}")
 
     def get_stats(self) -> Stats:
-        """Returns a copy of the current statistics."""
-        with self._lock:
-            # Return a copy to prevent external modification of the internal state
-            return Stats(**self._stats.__dict__)
+        """Returns a snapshot of the current statistics."""
+        # Building a new Stats object copies the values, so callers can't modify the counters
+        return Stats(**self._counts)
 
     def reset_stats(self):
         """Resets all statistics counters to zero."""
-        with self._lock:
-            self._stats = Stats()
-            logger.info("Runtime statistics reset.")
+        self._counts = dict.fromkeys(STAT_NAMES, 0)
+        logger.info("Runtime statistics reset.")
 
 # --- Singleton Instance ---
 # Provide a single instance for the application to use
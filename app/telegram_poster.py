@@ -1,10 +1,16 @@
 import logging
 import asyncio
-from urllib.parse import urlparse, urlunparse # Add this import
-from telegram import Bot
+import functools
+from collections import OrderedDict, deque
+from itertools import islice
+from datetime import timedelta
+from aiolimiter import AsyncLimiter
+from telegram import Bot, ReplyParameters
+from telegram.request import HTTPXRequest
 from telegram.constants import ParseMode
-from telegram.error import TelegramError, BadRequest # Import BadRequest specifically
+from telegram.error import TelegramError, BadRequest, RetryAfter # Import BadRequest specifically
 from .config import config_manager
+from . import api_client
 
 logger = logging.getLogger(__name__)
 
@@ -12,20 +18,285 @@ logger = logging.getLogger(__name__)
 CAPTION_MAX_LENGTH = 1024  # Max length for photo captions
 TEXT_MAX_LENGTH = 4096     # Max length for text messages
 
-# Initialize the Bot instance globally? Or per function call?
-# Initializing per call might be slightly less efficient but avoids potential
-# issues with async event loops if the main script structure changes.
-# Let's initialize per call for simplicity here.
+# --- Cached Settings ---
+@functools.lru_cache(maxsize=1)
+def _get_channel_id():
+    """Returns the configured channel ID, cached until the next config reload."""
+    return config_manager.get("telegram_channel_id")
 
-async def post_message(bot: Bot, title: str, body: str = "", image_url: str = None):
+config_manager.register_reload_callback(_get_channel_id.cache_clear)
+
+# --- Telegram MarkdownV2 Escaping ---
+# Characters to escape: _ * [ ] ( ) ~ ` > # + - = | { } . !
+# Shared by main (posts) and bot_interface (command replies). Callers escape text once
+# and pass the escaped string to post_message, so retries don't escape again.
+# Translation table mapping every special character to itself prefixed with a backslash.
+# str.translate does the whole substitution in a single C-level pass over the string.
+_MARKDOWN_V2_ESCAPE_TABLE = str.maketrans({c: "\\" + c for c in r"_*[]()~`>#+-=|{}.!"})
+
+def _escape_markdown_v2(text: str) -> str:
+    """Escapes a string for Telegram MarkdownV2 parsing (uncached)."""
+    return text.translate(_MARKDOWN_V2_ESCAPE_TABLE)
+
+# Titles, timestamps and hashtags (e.g. "#経済") repeat across articles and runs, so short
+# inputs are memoized. Longer texts such as article bodies bypass the cache so they
+# don't evict the entries that actually get reused.
+ESCAPE_CACHE_MAX_INPUT_LENGTH = 256
+_escape_markdown_v2_cached = functools.lru_cache(maxsize=2048)(_escape_markdown_v2)
+
+def escape_markdown_v2(text: str) -> str:
+    """Escapes text for Telegram MarkdownV2 parsing."""
+    if not isinstance(text, str):
+        return ""
+    if not text:
+        return text
+    if len(text) > ESCAPE_CACHE_MAX_INPUT_LENGTH:
+        return _escape_markdown_v2(text)
+    return _escape_markdown_v2_cached(text)
+
+# --- Image Cache ---
+# Images are downloaded by the bot and uploaded as bytes, so Telegram doesn't have to
+# fetch the URL itself (slow on some hosts). The most recent downloads are kept in memory,
+# bounded by their total size rather than a count since photos range up to 10 MB, so retries of the same post (e.g. after a 429) reuse the bytes. Downloads in flight are
+# shared, so a post whose image is still being prefetched waits for that download.
+PHOTO_MAX_BYTES = 10 * 1024 * 1024 # Telegram's upload limit for photos
+IMAGE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+_image_cache: OrderedDict[str, bytes] = OrderedDict()
+_image_cache_bytes = 0 # Total size of the cached images
+_image_downloads: dict[str, asyncio.Task] = {}
+
+def _clean_image_url(image_url: str) -> str:
+    """Removes query parameters (and any fragment) from an image URL."""
+    # Only the part before '?' is needed, so str.partition replaces a full URL parse
+    return image_url.partition('?')[0].partition('#')[0]
+
+async def _download_photo(image_url: str) -> bytes | None:
+    """Downloads an image and stores it in the image cache. Returns the bytes, or None on failure."""
+    global _image_cache_bytes
+    image_bytes = await api_client.download_image(image_url, PHOTO_MAX_BYTES)
+    if image_bytes is not None and len(image_bytes) <= IMAGE_CACHE_MAX_BYTES:
+        previous = _image_cache.pop(image_url, None)
+        if previous is not None:
+            _image_cache_bytes -= len(previous)
+        _image_cache[image_url] = image_bytes
+        _image_cache_bytes += len(image_bytes)
+        # Evict least recently used images until the cache fits its byte budget again
+        while _image_cache_bytes > IMAGE_CACHE_MAX_BYTES:
+            _, evicted = _image_cache.popitem(last=False)
+            _image_cache_bytes -= len(evicted)
+    return image_bytes
+
+def _on_photo_download_done(image_url: str, task: asyncio.Task):
+    """Drops a finished download from the in-flight map and retrieves its exception, if any."""
+    _image_downloads.pop(image_url, None)
+    # Prefetches whose post was cancelled are never awaited, so the exception is consumed here
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Image download failed for %s: %s", image_url, task.exception())
+
+def _start_photo_download(image_url: str) -> asyncio.Task:
+    """Returns the in-flight download task for an image, starting one if needed."""
+    task = _image_downloads.get(image_url)
+    if task is None:
+        task = asyncio.create_task(_download_photo(image_url))
+        _image_downloads[image_url] = task
+        task.add_done_callback(functools.partial(_on_photo_download_done, image_url))
+    return task
+
+async def _get_photo(image_url: str) -> bytes | str:
+    """Returns the image bytes (downloaded or cached), or the URL itself if the download fails."""
+    cached = _image_cache.get(image_url)
+    if cached is not None:
+        _image_cache.move_to_end(image_url)
+        logger.debug("Using cached image bytes for: %s", image_url)
+        return cached
+    # Shielded so a cancelled post doesn't cancel a download another post is waiting on
+    image_bytes = await asyncio.shield(_start_photo_download(image_url))
+    if image_bytes is None:
+        # Fall back to letting Telegram fetch the URL
+        return image_url
+    return image_bytes
+
+# --- Rate Limiting ---
+# Every send is paced under Telegram's documented limits (about 30 messages/second per bot,
+# about 1 message/second and 20 messages/minute per group or channel), so bursts wait for a
+# token instead of being rejected with HTTP 429 and retried. A split post (photo + text)
+# takes two tokens. The 20/minute bucket alone would allow its full capacity of 20 sends at
+# once, so each chat also gets a 1/second limiter that spaces the sends out.
+GLOBAL_RATE_LIMIT = (30, 1)         # (messages, seconds) across all chats
+CHANNEL_RATE_LIMIT = (20, 60)       # (messages, seconds) per chat
+CHANNEL_BURST_RATE_LIMIT = (1, 1)   # (messages, seconds) per chat, spacing consecutive sends
+_global_limiter = AsyncLimiter(*GLOBAL_RATE_LIMIT)
+_channel_limiters: dict[str, tuple[AsyncLimiter, AsyncLimiter]] = {}
+
+def _get_channel_limiters(chat_id) -> tuple[AsyncLimiter, AsyncLimiter]:
+    """Returns the (per-second, per-minute) rate limiters for a chat, creating them on first use."""
+    limiters = _channel_limiters.get(str(chat_id))
+    if limiters is None:
+        limiters = _channel_limiters[str(chat_id)] = (
+            AsyncLimiter(*CHANNEL_BURST_RATE_LIMIT),
+            AsyncLimiter(*CHANNEL_RATE_LIMIT),
+        )
+    return limiters
+
+def _retry_after_seconds(error: RetryAfter) -> float:
+    """Returns the wait requested by a RetryAfter error in seconds."""
+    # Newer python-telegram-bot versions report retry_after as a timedelta
+    return error.retry_after.total_seconds() if isinstance(error.retry_after, timedelta) else float(error.retry_after)
+
+def _nonblank(text: str | None) -> bool:
+    """Returns True if text contains any non-whitespace character."""
+    # str.isspace() stops at the first non-whitespace character and, unlike
+    # text.strip(), doesn't allocate a copy of a potentially multi-KB body
+    return bool(text) and not text.isspace()
+
+# Appended to text cut at a length limit
+TRUNCATION_MARKER = "…"
+
+def _truncate(text: str, limit: int) -> str:
+    """
+    Cuts text to at most `limit` characters, ending with TRUNCATION_MARKER.
+
+    Only call this for text longer than `limit`; text within the limit is used as-is
+    without any copy. A dangling escape backslash left at the cut is dropped, since
+    '\\…' is not a valid MarkdownV2 escape.
+    """
+    cut = text[:limit - len(TRUNCATION_MARKER)]
+    trailing_backslashes = len(cut) - len(cut.rstrip("\\"))
+    if trailing_backslashes % 2:
+        cut = cut[:-1]
+    return cut + TRUNCATION_MARKER
+
+# --- Flood Control ---
+# When Telegram answers 429 (RetryAfter), every send waits until the requested time has
+# passed, not just the one that was rejected, so concurrent posts don't keep hitting the
+# limit and extending the ban. Callers can check flood_wait_remaining() to schedule work.
+_flood_wait_until = 0.0 # Event loop time before which no send is attempted
+
+def _note_flood_wait(seconds: float):
+    """Records a flood-control wait requested by Telegram."""
+    global _flood_wait_until
+    _flood_wait_until = max(_flood_wait_until, asyncio.get_running_loop().time() + seconds)
+
+def flood_wait_remaining() -> float:
+    """Returns the seconds left on Telegram's current flood-control wait (0.0 if none). Must be called from the event loop."""
+    return max(0.0, _flood_wait_until - asyncio.get_running_loop().time())
+
+# Maximum attempts for a single Telegram API call that is rate limited (HTTP 429)
+MAX_SEND_ATTEMPTS = 3
+
+async def _call_with_retry(send_method, **kwargs):
+    """Calls a Bot send method under the rate limiters, waiting out Telegram's RetryAfter (HTTP 429) and retrying up to MAX_SEND_ATTEMPTS times."""
+    channel_burst_limiter, channel_limiter = _get_channel_limiters(kwargs.get("chat_id"))
+    for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+        wait = flood_wait_remaining()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        try:
+            async with _global_limiter, channel_limiter, channel_burst_limiter:
+                return await send_method(**kwargs)
+        except RetryAfter as e:
+            retry_after = _retry_after_seconds(e)
+            _note_flood_wait(retry_after)
+            if attempt == MAX_SEND_ATTEMPTS:
+                raise
+            logger.warning("Telegram rate limit hit (attempt %d/%d). Retrying in %.0fs...", attempt, MAX_SEND_ATTEMPTS, retry_after)
+
+# Timeouts (seconds) for the Bot's HTTP requests, shared by main's Application bot and the
+# fallback Bot below so both send paths behave the same (photo uploads need the long read timeout)
+TELEGRAM_CONNECT_TIMEOUT = 5.0
+TELEGRAM_READ_TIMEOUT = 30.0
+TELEGRAM_POOL_TIMEOUT = 5.0
+
+# --- Shared Bot ---
+# main.py passes in application.bot. Callers without a Bot (scripts, one-off jobs) pass
+# None and get one lazily built module-level instance instead of constructing their own,
+# so every post reuses the same keep-alive connection pool. Call shutdown() on exit.
+_bot_singleton: Bot | None = None
+_bot_lock = asyncio.Lock()
+
+async def _get_bot() -> Bot | None:
+    """Returns the shared module-level Bot, creating and initializing it on first use."""
+    global _bot_singleton
+    async with _bot_lock:
+        if _bot_singleton is None:
+            token = config_manager.get("telegram_bot_token")
+            if not token:
+                logger.error("Telegram Bot Token is not configured. Cannot create bot.")
+                return None
+            bot = Bot(token=token, request=HTTPXRequest(
+                connection_pool_size=16,
+                connect_timeout=TELEGRAM_CONNECT_TIMEOUT,
+                read_timeout=TELEGRAM_READ_TIMEOUT,
+                pool_timeout=TELEGRAM_POOL_TIMEOUT
+            ))
+            try:
+                await bot.initialize()
+            except TelegramError as e:
+                logger.error("Failed to initialize shared Telegram Bot: %s", e)
+                return None
+            _bot_singleton = bot
+            logger.debug("Created shared Telegram Bot instance.")
+    return _bot_singleton
+
+async def shutdown():
+    """Shuts down the shared Bot (if one was created). Call once on application shutdown."""
+    global _bot_singleton
+    if _bot_singleton is not None:
+        await _bot_singleton.shutdown()
+        _bot_singleton = None
+        logger.info("Shut down shared Telegram Bot instance.")
+
+# --- Bound Send Methods ---
+# Every message is sent as MarkdownV2, so parse_mode is bound once into partials of the
+# bot's send methods instead of being passed at each call site. Rebound if the bot changes.
+_MDV2 = ParseMode.MARKDOWN_V2
+_bound_bot: Bot | None = None
+_send_photo_mdv2 = None
+_send_message_mdv2 = None
+
+def _mdv2_senders(bot: Bot) -> tuple:
+    """Returns (send_photo, send_message) for the bot with parse_mode=MarkdownV2 pre-bound."""
+    global _bound_bot, _send_photo_mdv2, _send_message_mdv2
+    if bot is not _bound_bot:
+        _send_photo_mdv2 = functools.partial(bot.send_photo, parse_mode=_MDV2)
+        _send_message_mdv2 = functools.partial(bot.send_message, parse_mode=_MDV2)
+        _bound_bot = bot
+    return _send_photo_mdv2, _send_message_mdv2
+
+# --- Error Logging ---
+# Kept out of post_message so its error handlers stay one-liners.
+
+def _log_bad_request(error: BadRequest, channel_id, image_url: str | None, title: str, body: str | None):
+    """Logs a BadRequest together with the message content that triggered it."""
+    # The (possibly multi-KB) title and body are passed as arguments, so the record is only formatted if it is emitted
+    logger.error(
+        "Telegram BadRequest sending to %s: %s\nImage URL: %s\nProblematic title:\n---\n%s\n---\nProblematic body:\n---\n%s\n---",
+        channel_id, error, image_url, title, body if body is not None else "<empty or whitespace>"
+    )
+
+def _log_send_error(error: Exception, channel_id, image_url: str | None):
+    """Logs any other error raised while sending, with configuration hints for common Telegram errors."""
+    # Telegram errors are routine under load, so their traceback is only formatted when DEBUG
+    # logging is on; unexpected (non-Telegram) errors point at a bug and always carry one.
+    if isinstance(error, TelegramError):
+        logger.error("Telegram API error sending to %s (Image URL: %s): %s", channel_id, image_url, error, exc_info=logger.isEnabledFor(logging.DEBUG))
+        if "chat not found" in str(error):
+            logger.error("The configured TELEGRAM_CHANNEL_ID might be incorrect or the bot isn't added.")
+        elif "bot token is invalid" in str(error):
+             logger.error("The configured TELEGRAM_BOT_TOKEN is invalid.")
+        # Add more specific error checks if needed, e.g., for invalid image URLs
+    else:
+        logger.error("Unexpected error sending via Telegram (Image URL: %s): %s", image_url, error, exc_info=True)
+
+async def post_message(bot: Bot | None, title: str, body: str = "", image_url: str = None):
     """
     Sends a message (text or photo with caption) to the configured Telegram channel.
     If the message with an image is too long, it splits it into two messages:
     1. Image + Title (caption potentially truncated if title itself is too long)
-    2. Title + Body (full text, potentially truncated if it exceeds text message limits)
+    2. Body only, as a reply to the photo (potentially truncated if it exceeds text message limits)
 
     Args:
-        bot: The initialized telegram.Bot instance.
+        bot: The initialized telegram.Bot instance, or None to use the shared module-level Bot.
         title: The title of the message.
         body: Optional body of the message.
         image_url: Optional URL of the image to send.
@@ -33,131 +304,322 @@ async def post_message(bot: Bot, title: str, body: str = "", image_url: str = No
     Returns:
         The message_id of the sent message (or the second message if split) if successful, None otherwise.
     """
+    # Cheap input checks first, before any config lookups or network I/O
+    if not title: # Changed from message to title
+        logger.warning("Attempted to send a message with an empty title to Telegram.")
+        return None
+    if image_url and not image_url.startswith(("http://", "https://")):
+        # Telegram can't fetch it and we can't download it; a guaranteed BadRequest otherwise
+        logger.warning(f"Ignoring image with unsupported URL scheme: {image_url}")
+        image_url = None
+
     # Get channel ID from config
-    channel_id = config_manager.get("telegram_channel_id")
+    channel_id = _get_channel_id()
 
     if not channel_id:
         logger.error("Telegram Channel ID is not configured. Cannot send message.")
         return None # Return None for consistency with other error returns
-    if not bot:
-        logger.error("Telegram Bot instance was not provided. Cannot send message.")
-        return None
 
-    if not title: # Changed from message to title
-        logger.warning("Attempted to send a message with an empty title to Telegram.")
-        return None
+    if bot is None:
+        bot = await _get_bot()
+        if bot is None:
+            return None
+    logger.debug("Attempting to send message to Telegram channel %s using provided bot instance...", channel_id)
+    send_photo, send_message = _mdv2_senders(bot)
 
-    # Bot instance is now passed in
-    logger.debug(f"Attempting to send message to Telegram channel {channel_id} using provided bot instance...")
-
-    # Construct the full message text
-    full_message_text = title
-    if body and body.strip(): # Ensure body is not empty or just whitespace
-        full_message_text = f"{title}\n\n{body}" # Using double newline for better separation
+    has_body = _nonblank(body)
+    title_len = len(title)
 
     try:
+        photo = None
         if image_url:
-            # Remove query parameters from image_url to avoid issues with some Telegram clients/APIs
-            parsed_url = urlparse(image_url)
-            image_url = urlunparse(parsed_url._replace(query=""))
-            logger.debug(f"Cleaned image URL: {image_url}")
+            # Remove query parameters (and any fragment) from image_url to avoid issues with some Telegram clients/APIs.
+            image_url = _clean_image_url(image_url)
+            logger.debug("Cleaned image URL: %s", image_url)
+            photo = await _get_photo(image_url)
 
-            if len(full_message_text) > CAPTION_MAX_LENGTH:
-                logger.info(f"Caption for image is too long ({len(full_message_text)} chars, limit {CAPTION_MAX_LENGTH}). Splitting message.")
+        if not has_body:
+            # Title-only post (common for headlines): a single send with the title as-is,
+            # skipping message composition and the caption-vs-text split logic below
+            if photo is not None:
+                caption = title if title_len <= CAPTION_MAX_LENGTH else _truncate(title, CAPTION_MAX_LENGTH)
+                sent_message = await _call_with_retry(
+                    send_photo,
+                    chat_id=channel_id,
+                    photo=photo,
+                    caption=caption
+                )
+            else:
+                text = title if title_len <= TEXT_MAX_LENGTH else _truncate(title, TEXT_MAX_LENGTH)
+                sent_message = await _call_with_retry(
+                    send_message,
+                    chat_id=channel_id,
+                    text=text
+                )
+            logger.info("Successfully sent title-only message (ID: %s) to Telegram channel %s.", sent_message.message_id, channel_id)
+            return sent_message.message_id
+
+        # Construct the full message text
+        # Every remaining branch sends the combined text (as the caption or the text message)
+        # or its body (as the second part of a split post), so it is composed exactly once here.
+        full_message_text = title + "\n\n" + body # Using double newline for better separation
+        # Lengths are used by every branch and log line below; compute them once
+        full_len = len(full_message_text)
+
+        if photo is not None:
+            if full_len > CAPTION_MAX_LENGTH:
+                logger.info("Caption for image is too long (%d chars, limit %d). Splitting message.", full_len, CAPTION_MAX_LENGTH)
                 
                 # Message 1: Photo + Title (caption)
                 caption_for_photo = title
-                if len(title) > CAPTION_MAX_LENGTH:
-                    logger.warning(f"Title itself ({len(title)} chars) exceeds CAPTION_MAX_LENGTH ({CAPTION_MAX_LENGTH}). Truncating for photo caption.")
-                    caption_for_photo = title[:CAPTION_MAX_LENGTH]
-                
-                sent_photo_msg = await bot.send_photo(
+                if title_len > CAPTION_MAX_LENGTH:
+                    logger.warning("Title itself (%d chars) exceeds CAPTION_MAX_LENGTH (%d). Truncating for photo caption.", title_len, CAPTION_MAX_LENGTH)
+                    caption_for_photo = _truncate(title, CAPTION_MAX_LENGTH)
+
+                # Message 2: Body only (the title is already on the photo), linked to the photo as a reply.
+                # Prepared up front so it goes out as soon as the photo is accepted.
+                text_for_second_message = body
+                second_len = len(text_for_second_message)
+                if second_len > TEXT_MAX_LENGTH:
+                    logger.warning("Text content for second message (%d chars) exceeds TEXT_MAX_LENGTH (%d). It will be truncated.", second_len, TEXT_MAX_LENGTH)
+                    text_for_second_message = _truncate(text_for_second_message, TEXT_MAX_LENGTH)
+
+                # The two sends are deliberately sequential rather than gathered: Telegram orders
+                # messages by arrival, and concurrent requests could put the text above its photo.
+                # (send_media_group can't help here: it needs 2-10 media items and carries no separate text.)
+                sent_photo_msg = await _call_with_retry(
+                    send_photo,
                     chat_id=channel_id,
-                    photo=image_url,
-                    caption=caption_for_photo,
-                    parse_mode=ParseMode.MARKDOWN_V2
+                    photo=photo,
+                    caption=caption_for_photo
                 )
-                logger.info(f"Successfully sent photo part (ID: {sent_photo_msg.message_id}) to {channel_id}.")
+                logger.info("Successfully sent photo part (ID: %s) to %s.", sent_photo_msg.message_id, channel_id)
 
-                # Message 2: Title + Body (text)
-                text_for_second_message = full_message_text
-                if len(full_message_text) > TEXT_MAX_LENGTH:
-                    logger.warning(f"Full text content for second message ({len(full_message_text)} chars) exceeds TEXT_MAX_LENGTH ({TEXT_MAX_LENGTH}). It will be truncated.")
-                    text_for_second_message = full_message_text[:TEXT_MAX_LENGTH]
-                
-                sent_text_msg = await bot.send_message(
+                sent_text_msg = await _call_with_retry(
+                    send_message,
                     chat_id=channel_id,
                     text=text_for_second_message,
-                    parse_mode=ParseMode.MARKDOWN_V2
+                    reply_parameters=ReplyParameters(message_id=sent_photo_msg.message_id)
                 )
-                logger.info(f"Successfully sent text part (ID: {sent_text_msg.message_id}) to {channel_id}.")
+                logger.info("Successfully sent text part (ID: %s) to %s.", sent_text_msg.message_id, channel_id)
                 return sent_text_msg.message_id # Return ID of the second message
             else:
                 # Caption is not too long, send as a single photo with caption
-                logger.info(f"Sending photo with caption (length {len(full_message_text)}) to {channel_id}...")
-                sent_message = await bot.send_photo(
+                logger.info("Sending photo with caption (length %d) to %s...", full_len, channel_id)
+                sent_message = await _call_with_retry(
+                    send_photo,
                     chat_id=channel_id,
-                    photo=image_url,
-                    caption=full_message_text,
-                    parse_mode=ParseMode.MARKDOWN_V2
+                    photo=photo,
+                    caption=full_message_text
                 )
-                logger.info(f"Successfully sent photo (ID: {sent_message.message_id}) to Telegram channel {channel_id}.")
+                logger.info("Successfully sent photo (ID: %s) to Telegram channel %s.", sent_message.message_id, channel_id)
                 return sent_message.message_id
         else:
             # No image, send as a text message
-            text_to_send = full_message_text
-            if len(full_message_text) > TEXT_MAX_LENGTH:
-                logger.warning(f"Text message content ({len(full_message_text)} chars) exceeds TEXT_MAX_LENGTH ({TEXT_MAX_LENGTH}). It will be truncated.")
-                text_to_send = full_message_text[:TEXT_MAX_LENGTH]
+            if full_len > TEXT_MAX_LENGTH:
+                logger.warning("Text message content (%d chars) exceeds TEXT_MAX_LENGTH (%d). It will be truncated.", full_len, TEXT_MAX_LENGTH)
+                text_to_send = _truncate(full_message_text, TEXT_MAX_LENGTH)
+            else:
+                text_to_send = full_message_text # Within the limit: no copy
 
-            logger.info(f"Sending text message (length {len(text_to_send)}) to {channel_id}...")
-            sent_message = await bot.send_message(
+            logger.info("Sending text message (length %d) to %s...", min(full_len, TEXT_MAX_LENGTH), channel_id)
+            sent_message = await _call_with_retry(
+                send_message,
                 chat_id=channel_id,
-                text=text_to_send,
-                parse_mode=ParseMode.MARKDOWN_V2
+                text=text_to_send
                 # Consider adding disable_web_page_preview=True if desired
             )
-            logger.info(f"Successfully sent text message (ID: {sent_message.message_id}) to Telegram channel {channel_id}.")
+            logger.info("Successfully sent text message (ID: %s) to Telegram channel %s.", sent_message.message_id, channel_id)
             return sent_message.message_id
     except BadRequest as e: # Catch BadRequest specifically
-        # Log the specific error and the message content
-        log_message = f"Telegram BadRequest sending to {channel_id}: {e}"
-        if image_url:
-            log_message += f"\nImage URL: {image_url}"
-        # Updated logging for title and body
-        log_message += f"\nProblematic title:\n---\n{title}\n---"
-        if body and body.strip():
-             log_message += f"\nProblematic body:\n---\n{body}\n---"
-        else:
-             log_message += f"\nBody was empty or whitespace.\n---"
-        logger.error(log_message)
+        _log_bad_request(e, channel_id, image_url, title, body if has_body else None)
         return None
-    except TelegramError as e:
-        # Catch other Telegram API errors
-        logger.exception(f"Telegram API error sending to {channel_id} (Image URL: {image_url}): {e}")
-        if "chat not found" in str(e):
-            logger.error("The configured TELEGRAM_CHANNEL_ID might be incorrect or the bot isn't added.")
-        elif "bot token is invalid" in str(e):
-             logger.error("The configured TELEGRAM_BOT_TOKEN is invalid.")
-        # Add more specific error checks if needed, e.g., for invalid image URLs
+    except RetryAfter as e:
+        # Still rate limited after all retries. The wait is recorded by _call_with_retry, so
+        # later sends hold off on their own; callers can read it from flood_wait_remaining().
+        logger.error("Telegram rate limit persisted after %d attempts sending to %s. Giving up on this message; sends resume in %.0fs.", MAX_SEND_ATTEMPTS, channel_id, _retry_after_seconds(e))
         return None
     except Exception as e:
-        # Catch other potential exceptions
-        logger.exception(f"Unexpected error sending via Telegram (Image URL: {image_url}): {e}")
+        _log_send_error(e, channel_id, image_url)
         return None
-    finally:
-        # Ensure the bot session is closed if necessary (depends on library version and usage)
-        # For v20+, Application.run_polling handles this, but here we use Bot directly.
-        # Explicitly closing the bot instance might be needed in some scenarios.
-        # await bot.shutdown() # Check if needed for direct Bot usage
-        pass
-
-# Example usage (would be called from main.py within an async function)
-# async def main_task():
-#     # ... other logic ...
-#     formatted_message = "..."
-#     success = await post_message(formatted_message)
-#     if success:
-#         # ...
-#     else:
-#         # ...
\ No newline at end of file
+
+# --- Send Queue ---
+# Producers (the news check) enqueue posts and get a future back instead of awaiting
+# Telegram themselves; a fixed pool of worker tasks drains the queue through post_message,
+# so the rate limiters and flood control above still apply. With one worker, posts go
+# out strictly in the order they were enqueued.
+#
+# The sends of one post (and of consecutive posts) must stay sequential to keep their order
+# in the channel, so the overlap comes from the images instead: whenever a worker takes a
+# job, it starts downloading the images of the next few queued posts, while the current one
+# is being sent. Only PHOTO_PREFETCH_DEPTH posts ahead are prefetched so their images aren't
+# evicted from the small image cache before they are used.
+SEND_QUEUE_MAX_SIZE = 200
+PHOTO_PREFETCH_DEPTH = 4
+_send_queue: asyncio.Queue | None = None
+_sender_tasks: list[asyncio.Task] = []
+# Cleaned image URL (or None) of every queued job, in queue order, for prefetching
+_queued_image_urls: deque[str | None] = deque()
+
+def _prefetch_queued_photos():
+    """Starts downloading the images of the next PHOTO_PREFETCH_DEPTH queued posts."""
+    for image_url in islice(_queued_image_urls, PHOTO_PREFETCH_DEPTH):
+        if image_url and image_url not in _image_cache:
+            _start_photo_download(image_url)
+
+async def _sender_worker(bot: Bot | None):
+    """Sends queued posts one at a time, resolving each job's future with the message_id (or None)."""
+    while True:
+        title, body, image_url, future = await _send_queue.get()
+        _queued_image_urls.popleft()
+        _prefetch_queued_photos()
+        try:
+            if future.cancelled():
+                continue
+            try:
+                message_id = await post_message(bot, title, body, image_url)
+            except Exception as e: # post_message handles its own errors; this is a last resort
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(message_id)
+        finally:
+            _send_queue.task_done()
+
+def start_sender(bot: Bot | None, workers: int = 1):
+    """
+    Starts the send queue and its worker tasks. Call once from the running event loop.
+
+    Args:
+        bot: The Bot used by the workers, or None to use the shared module-level Bot.
+        workers: Number of posts sent concurrently. 1 keeps posts in enqueue order.
+    """
+    global _send_queue
+    if _sender_tasks:
+        logger.warning("Telegram sender workers already running.")
+        return
+    _send_queue = asyncio.Queue(maxsize=SEND_QUEUE_MAX_SIZE)
+    workers = max(1, workers)
+    for index in range(workers):
+        _sender_tasks.append(asyncio.create_task(_sender_worker(bot), name=f"telegram-sender-{index}"))
+    logger.info("Started %d Telegram sender worker(s).", workers)
+
+async def stop_sender():
+    """Stops the worker tasks and cancels any posts still waiting in the queue."""
+    global _send_queue
+    if not _sender_tasks:
+        return
+    pending = [*_sender_tasks, *_image_downloads.values()]
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    _sender_tasks.clear()
+    while not _send_queue.empty():
+        _, _, _, future = _send_queue.get_nowait()
+        future.cancel()
+    _queued_image_urls.clear()
+    _send_queue = None
+    logger.info("Stopped Telegram sender workers.")
+
+async def enqueue_message(title: str, body: str = "", image_url: str = None) -> asyncio.Future:
+    """
+    Queues a post for the sender workers (see post_message for the arguments).
+
+    Waits only if the queue is full. Returns a future that resolves to the message_id of the
+    sent message, or None if sending failed.
+
+    Raises:
+        RuntimeError: If start_sender() has not been called.
+    """
+    if _send_queue is None:
+        raise RuntimeError("Telegram sender is not running; call start_sender() first.")
+    future = asyncio.get_running_loop().create_future()
+    await _send_queue.put((title, body, image_url, future))
+    # Recorded after put() so the deque stays aligned with the queue even if put() had to wait
+    if image_url and image_url.startswith(("http://", "https://")):
+        _queued_image_urls.append(_clean_image_url(image_url))
+    else:
+        _queued_image_urls.append(None)
+    return future
+
+# Separator placed between items combined into one batched message
+BATCH_ITEM_SEPARATOR = "\n\n"
+
+async def post_messages_batch(bot: Bot | None, items: list[tuple[str, str]]) -> list[int | None]:
+    """
+    Sends several short text-only items, combining as many as fit into one message.
+
+    Items are joined with BATCH_ITEM_SEPARATOR in order and flushed as a single
+    send_message whenever the next item would push the text past TEXT_MAX_LENGTH,
+    so N short items cost roughly one request per 4096 characters instead of N.
+    An item that is too long on its own is sent through post_message (and truncated there).
+    Items with images are not supported here; send them with post_message.
+
+    Args:
+        bot: The initialized telegram.Bot instance, or None to use the shared module-level Bot.
+        items: A list of (title, body) tuples, already escaped for MarkdownV2.
+
+    Returns:
+        A list aligned with `items`. Each element is the message_id of the message that
+        item was sent in (items combined into one message share its ID), or None if the
+        item was skipped (empty title) or its message could not be sent.
+    """
+    message_ids: list[int | None] = [None] * len(items)
+    if not items:
+        return message_ids
+    channel_id = _get_channel_id()
+    if not channel_id:
+        logger.error("Telegram Channel ID is not configured. Cannot send messages.")
+        return message_ids
+    if bot is None:
+        bot = await _get_bot()
+        if bot is None:
+            return message_ids
+    send_message = _mdv2_senders(bot)[1]
+
+    buffer: list[str] = []
+    buffer_indexes: list[int] = [] # Positions in `items` of the buffered texts
+    buffer_len = 0
+
+    async def _flush():
+        nonlocal buffer_len
+        if not buffer:
+            return
+        text = BATCH_ITEM_SEPARATOR.join(buffer)
+        indexes = buffer_indexes.copy()
+        buffer.clear()
+        buffer_indexes.clear()
+        buffer_len = 0
+        try:
+            sent_message = await _call_with_retry(
+                send_message,
+                chat_id=channel_id,
+                text=text
+            )
+        except TelegramError as e:
+            logger.error("Telegram error sending batch of %d items to %s: %s", len(indexes), channel_id, e)
+            return
+        logger.info("Successfully sent batch of %d items (ID: %s) to %s.", len(indexes), sent_message.message_id, channel_id)
+        for index in indexes:
+            message_ids[index] = sent_message.message_id
+
+    for index, (title, body) in enumerate(items):
+        if not title:
+            logger.warning("Skipping batch item with an empty title.")
+            continue
+        item_text = title + "\n\n" + body if _nonblank(body) else title
+        item_len = len(item_text)
+        if item_len > TEXT_MAX_LENGTH:
+            # Too long to share a message; send it on its own after whatever is buffered
+            await _flush()
+            message_ids[index] = await post_message(bot, title, body)
+            continue
+        if buffer and buffer_len + len(BATCH_ITEM_SEPARATOR) + item_len > TEXT_MAX_LENGTH:
+            await _flush()
+        buffer_len += (len(BATCH_ITEM_SEPARATOR) if buffer else 0) + item_len
+        buffer.append(item_text)
+        buffer_indexes.append(index)
+    await _flush()
+
+    return message_ids
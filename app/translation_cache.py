@@ -0,0 +1,166 @@
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# --- Persistent Translation Cache ---
+# Stores OpenAI translation results in a small SQLite database keyed by a hash of
+# (model, prompt version, title, body), so re-processing the same article (re-runs,
+# articles that failed to post, identical wire stories) doesn't pay for another API call.
+#
+# The public functions are coroutines: the blocking sqlite work (including the commit's
+# fsync) runs in a worker thread via asyncio.to_thread, so concurrent translations and the
+# Telegram senders keep running. Expired entries are evicted by evict_expired(), called once
+# per run, rather than on every write.
+
+_SCHEMA_STATEMENTS = (
+    "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, payload TEXT NOT NULL, ts INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_translations_ts ON translations (ts)",
+)
+
+# One connection per database file, opened lazily and reused for the lifetime of the process.
+# Connections are used from worker threads, so all access is serialized through _lock.
+_connections: dict[str, sqlite3.Connection] = {}
+_lock = threading.Lock()
+
+
+def make_cache_key(model: str, prompt_version: int, title: str, body: str) -> str:
+    """Builds the cache key for a translation request."""
+    raw_key = f"{model}|{prompt_version}|{title}|{body}"
+    return hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+
+
+def _get_connection(filepath: str) -> sqlite3.Connection | None:
+    """Returns the (cached) connection for the given database file, creating the schema if needed."""
+    connection = _connections.get(filepath)
+    if connection is not None:
+        return connection
+    try:
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(filepath, check_same_thread=False)
+        for statement in _SCHEMA_STATEMENTS:
+            connection.execute(statement)
+        connection.commit()
+    except sqlite3.Error as e:
+        logger.error(f"Could not open translation cache database {filepath}: {e}. Caching disabled for this call.")
+        return None
+    except OSError as e:
+        logger.error(f"Could not create directory for translation cache {filepath}: {e}. Caching disabled for this call.")
+        return None
+    _connections[filepath] = connection
+    logger.info(f"Opened translation cache database: {filepath}")
+    return connection
+
+
+async def get_cached_translation(filepath: str, key: str, ttl_seconds: int) -> dict | None:
+    """
+    Looks up a cached translation result.
+
+    Args:
+        filepath: Path to the SQLite cache database.
+        key: The cache key from make_cache_key().
+        ttl_seconds: Maximum age of an entry. Entries older than this are treated as missing.
+
+    Returns:
+        The cached result dictionary, or None on a miss or error.
+    """
+    row = await asyncio.to_thread(_read_payload, filepath, key, ttl_seconds)
+    if row is None:
+        return None
+    try:
+        result = orjson.loads(row[0])
+    except orjson.JSONDecodeError:
+        logger.warning(f"Discarding corrupt translation cache entry {key[:12]}...")
+        return None
+    return result if isinstance(result, dict) else None
+
+
+def _read_payload(filepath: str, key: str, ttl_seconds: int) -> tuple | None:
+    """Blocking part of get_cached_translation(); runs in a worker thread."""
+    with _lock:
+        connection = _get_connection(filepath)
+        if connection is None:
+            return None
+        try:
+            return connection.execute(
+                "SELECT payload FROM translations WHERE key = ? AND ts >= ?",
+                (key, int(time.time()) - ttl_seconds)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading from translation cache {filepath}: {e}")
+            return None
+
+
+async def store_translation(filepath: str, key: str, result: dict):
+    """
+    Stores a translation result.
+
+    Args:
+        filepath: Path to the SQLite cache database.
+        key: The cache key from make_cache_key().
+        result: The validated translation result dictionary.
+    """
+    payload = orjson.dumps(result).decode('utf-8')
+    await asyncio.to_thread(_write_payload, filepath, key, payload)
+
+
+def _write_payload(filepath: str, key: str, payload: str):
+    """Blocking part of store_translation(); runs in a worker thread."""
+    with _lock:
+        connection = _get_connection(filepath)
+        if connection is None:
+            return
+        try:
+            with connection: # Commits on success, rolls back on error
+                connection.execute(
+                    "INSERT OR REPLACE INTO translations (key, payload, ts) VALUES (?, ?, ?)",
+                    (key, payload, int(time.time()))
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Error writing to translation cache {filepath}: {e}")
+
+
+async def evict_expired(filepath: str, ttl_seconds: int):
+    """
+    Deletes entries older than the TTL. Call once per run, not per article.
+
+    Args:
+        filepath: Path to the SQLite cache database.
+        ttl_seconds: Maximum age of an entry; older entries are deleted.
+    """
+    await asyncio.to_thread(_delete_expired, filepath, ttl_seconds)
+
+
+def _delete_expired(filepath: str, ttl_seconds: int):
+    """Blocking part of evict_expired(); runs in a worker thread."""
+    with _lock:
+        connection = _get_connection(filepath)
+        if connection is None:
+            return
+        try:
+            with connection:
+                deleted = connection.execute("DELETE FROM translations WHERE ts < ?", (int(time.time()) - ttl_seconds,)).rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Error evicting expired entries from translation cache {filepath}: {e}")
+            return
+    if deleted:
+        logger.debug("Evicted %d expired entries from translation cache %s", deleted, filepath)
+
+
+def close():
+    """Closes all open cache database connections. Call once on application shutdown."""
+    with _lock:
+        for filepath, connection in list(_connections.items()):
+            try:
+                connection.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing translation cache {filepath}: {e}")
+        _connections.clear()